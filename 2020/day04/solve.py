@@ -1,73 +1,321 @@
 #!/usr/bin/env python
 import re
 import sys
+from abc import ABC, abstractmethod
+from argparse import ArgumentParser
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import read, record_breaks, rstrip, unix_newlines  # noqa: E402
+
+
+def slices(data, starts, ends, width=None):
+    """Bytes of ``data`` between each start and end as a byte string array.
+
+    ``data`` must go on past the last end for as long as the longest slice,
+    or ``width`` when given.
+    """
+    if width is None:
+        width = max(int((ends - starts).max(initial=0)), 1)
+    matrix = np.lib.stride_tricks.sliding_window_view(data, width)[starts]
+    matrix[np.arange(width) >= (ends - starts)[:, None]] = 0
+    return matrix.view(f'S{width}').ravel()
+
+
+class Passports:
+    """Columnar store of passports.
+
+    Each field is an array of byte strings, empty where the field is
+    missing, and the fields present in each passport are a bitmask.
+    """
+
+    def __init__(self, columns, present):
+        self.columns = columns
+        self.present = present
+        self.bits = {field: 1 << i for i, field in enumerate(columns)}
+
+    @classmethod
+    def from_bytes(cls, data):
+        # Records are split on \n\n, which \r\n line endings would hide
+        data = rstrip(unix_newlines(data))
+        # Tokens are the runs of non blank bytes, each a key:value field
+        blank = np.ones(data.size + 2, bool)
+        blank[1:-1] = data <= ord(' ')
+        changes = np.flatnonzero(blank[1:] != blank[:-1])
+        starts, ends = changes[::2], changes[1::2]
+        colons = np.flatnonzero(data == ord(':'))
+        if (colons.size != starts.size
+                or not ((starts < colons) & (colons < ends)).all()):
+            raise ValueError('Fields must be key:value pairs')
+
+        # Number passports from 0, skipping extra blank lines
+        records = np.searchsorted(record_breaks(data), starts)
+        records = np.cumsum(np.diff(records, prepend=-1) > 0) - 1
+        n = int(records[-1]) + 1 if records.size else 0
+
+        # Keys are few, spot them by their bytes packed in an integer
+        if (colons - starts).max(initial=0) > 8:
+            raise ValueError('Keys longer than 8 bytes')
+        padded = np.append(data, np.zeros(int((ends - starts).max(initial=8)),
+                                          np.uint8))
+        codes = slices(padded, starts, colons, 8).view(np.uint64)
+        fields = []
+        field_ids = np.zeros(starts.size, np.int8)
+        unknown = np.ones(starts.size, bool)
+        while unknown.any():
+            if len(fields) == 64:
+                raise ValueError('Too many fields')
+            first = int(np.argmax(unknown))
+            same = codes == codes[first]
+            field_ids[same] = len(fields)
+            unknown &= ~same
+            fields.append(data[starts[first]:colons[first]].tobytes())
+
+        # Group the fields of each key together
+        order = np.argsort(field_ids, kind='stable')
+        bounds = np.cumsum(np.bincount(field_ids, minlength=len(fields)))
+        columns = {}
+        present = np.zeros(n, np.uint64)
+        for bit, (field, selected) in enumerate(zip(fields,
+                                                    np.split(order, bounds))):
+            column = slices(padded, colons[selected] + 1, ends[selected])
+            columns[field.decode()] = np.zeros(n, column.dtype)
+            columns[field.decode()][records[selected]] = column
+            present[records[selected]] |= np.uint64(1 << bit)
+        return cls(columns, present)
+
+    def __len__(self):
+        return len(self.present)
+
+    def __getitem__(self, field):
+        try:
+            return self.columns[field]
+        except KeyError:
+            return np.zeros(len(self), 'S1')
+
+    def have(self, fields):
+        """Whether each passport has all of ``fields``."""
+        if any(field not in self.bits for field in fields):
+            return np.zeros(len(self), bool)
+        mask = np.uint64(sum(self.bits[field] for field in fields))
+        return (self.present & mask) == mask
 
 
 def parse(filename):
-    with open(filename) as f:
-        lines = [l.split() for l in f.readlines()]
-    lines.append([])
-
-    passports = []
-    current = {}
-    for line in lines:
-        if not line:
-            passports.append(current)
-            current = {}
-            continue
-        for field in line:
-            k, v = field.split(':')
-            current[k] = v
-
-    return passports
-
-
-def validate_field(f, v):
-    try:
-        if f == 'byr' and len(v) == 4 and 1920 <= int(v) <= 2002:
-            return True
-        elif f == 'iyr' and len(v) == 4 and 2010 <= int(v) <= 2020:
-            return True
-        elif f == 'eyr' and len(v) == 4 and 2020 <= int(v) <= 2030:
-            return True
-        elif f == 'hgt' and ((v[-2:] == 'cm' and 150 <= int(v[:-2]) <= 193)
-                             or (v[-2:] == 'in' and 59 <= int(v[:-2]) <= 76)):
-            return True
-        elif f == 'hcl' and re.match(r'#[0-9a-f]{6}$', v):
-            return True
-        elif f == 'ecl' and v in ['amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth']:
-            return True
-        elif f == 'pid' and re.match(r'[0-9]{9}$', v):
-            return True
-    except ValueError:
-        pass
-
-    return False
-
-
-def count_valid(passports, fields=['byr', 'iyr', 'eyr', 'hgt', 'hcl', 'ecl', 'pid']):
-    count = 0
-    for p in passports:
-        for field in fields:
-            try:
-                value = p[field]
-            except KeyError:
-                break
-            else:
-                if not validate_field(field, value):
-                    break
+    return Passports.from_bytes(read(filename))
+
+
+def chars(column):
+    """Byte strings of a column as rows of a uint8 matrix, 0 padded."""
+    return column.view(np.uint8).reshape(len(column), column.itemsize)
+
+
+def number(column, suffix=b''):
+    """Whether each value is a number followed by ``suffix``, and its value."""
+    matrix = chars(column)
+    lengths = np.char.str_len(column) - len(suffix)
+    valid = (lengths > 0) & (lengths <= 18)
+    if suffix:
+        valid &= np.char.endswith(column, suffix)
+    value = np.zeros(len(column), np.int64)
+    for i in range(matrix.shape[1]):
+        inside = i < lengths
+        digit = matrix[:, i] - np.uint8(ord('0'))
+        valid &= ~inside | (digit < 10)
+        value = np.where(inside, value * 10 + digit, value)
+    return valid, value
+
+
+class Rule(ABC):
+    @abstractmethod
+    def compile(self):
+        """Function telling which values of a whole column are valid."""
+
+
+@dataclass(frozen=True)
+class Range(Rule):
+    low: int
+    high: int
+    length: Optional[int] = None
+
+    def compile(self):
+        def check(column):
+            valid, value = number(column)
+            if self.length is not None:
+                valid &= np.char.str_len(column) == self.length
+            return valid & (self.low <= value) & (value <= self.high)
+        return check
+
+
+@dataclass(frozen=True)
+class UnitRange(Rule):
+    units: dict
+
+    def compile(self):
+        def check(column):
+            valid = np.zeros(len(column), bool)
+            for unit, (low, high) in self.units.items():
+                ok, value = number(column, unit.encode())
+                valid |= ok & (low <= value) & (value <= high)
+            return valid
+        return check
+
+
+@dataclass(frozen=True)
+class OneOf(Rule):
+    values: tuple
+
+    def compile(self):
+        values = np.array([v.encode() for v in self.values])
+        return lambda column: np.isin(column, values)
+
+
+@dataclass(frozen=True)
+class Regex(Rule):
+    pattern: str
+
+    def compile(self):
+        tables = lookup_tables(self.pattern)
+        if tables is None:
+            regex = re.compile(self.pattern)
+            return lambda column: np.fromiter(
+                (regex.fullmatch(v.decode()) is not None for v in column),
+                bool, len(column))
+
+        # Fixed length patterns are one table of allowed bytes per position
+        def check(column):
+            matrix = chars(column)
+            if matrix.shape[1] < len(tables):
+                return np.zeros(len(column), bool)
+            positions = np.arange(len(tables))
+            return ((np.char.str_len(column) == len(tables))
+                    & tables[positions, matrix[:, :len(tables)]].all(axis=1))
+        return check
+
+
+# A literal, an escape or a character class, and how many times it repeats
+ATOM = re.compile(r'(\\.|\[\^?[^]\\]+\]|[^\\[\]{}()|.*+?^$])(?:\{(\d+)\})?')
+
+
+def lookup_tables(pattern):
+    """Allowed bytes at each position of a fixed length regex.
+
+    Only literals and character classes, repeated a fixed number of times,
+    are supported, otherwise None is returned.
+    """
+    tables = []
+    position = 0
+    while position < len(pattern):
+        match = ATOM.match(pattern, position)
+        if not match:
+            return None
+        atom, repeat = match[1], int(match[2] or 1)
+        table = np.zeros(256, bool)
+        if atom == r'\d':
+            table[ord('0'):ord('9') + 1] = True
+        elif atom.startswith('\\'):
+            if atom[1].isalnum():
+                return None
+            table[ord(atom[1])] = True
+        elif atom.startswith('['):
+            members = atom[2:-1] if atom[1] == '^' else atom[1:-1]
+            for low, high in re.findall(r'(.)(?:-(.))?', members):
+                table[ord(low):ord(high or low) + 1] = True
+            if atom[1] == '^':
+                table = ~table
         else:
-            count += 1
+            table[ord(atom)] = True
+        tables.extend([table] * repeat)
+        position = match.end()
+    return np.array(tables) if tables else None
 
-    return count
 
+class Schema:
+    """Compiled rules of the fields of a document.
 
-def main(filename):
-    passports = parse(filename)
-    print(count_valid(passports))
+    Counts how many values failed each rule, and how many documents missed
+    each field, over the documents of the last ``count``.
+    """
 
+    def __init__(self, rules, checks=None):
+        self.rules = rules
+        if checks is None:
+            checks = {field: rule.compile() for field, rule in rules.items()}
+        self.checks = checks
+        self.failures = Counter()
+        self.missing = Counter()
 
+    def only(self, fields):
+        """Schema of some of the fields, sharing their compiled checks."""
+        return Schema({field: self.rules[field] for field in fields},
+                      {field: self.checks[field] for field in fields})
+
+    def count(self, passports):
+        """Number of documents with all the fields present, and also valid."""
+        self.failures, self.missing = Counter(), Counter()
+        present = np.ones(len(passports), bool)
+        valid = np.ones(len(passports), bool)
+        for field, check in self.checks.items():
+            has = passports.have([field])
+            ok = np.zeros(len(passports), bool)
+            ok[has] = check(passports[field][has])
+            present &= has
+            valid &= ok
+            self.missing[field] += len(passports) - int(has.sum())
+            self.failures[field] += int(has.sum()) - int(ok.sum())
+        return int(present.sum()), int(valid.sum())
+
+
+RULES = {
+    'byr': Range(1920, 2002, length=4),
+    'iyr': Range(2010, 2020, length=4),
+    'eyr': Range(2020, 2030, length=4),
+    'hgt': UnitRange({'cm': (150, 193), 'in': (59, 76)}),
+    'hcl': Regex(r'#[0-9a-f]{6}'),
+    'ecl': OneOf(('amb', 'blu', 'brn', 'gry', 'grn', 'hzl', 'oth')),
+    'pid': Regex(r'[0-9]{9}'),
+}
+PASSPORT = Schema(RULES)
+
+
+def count_valid(passports, fields=None):
+    schema = PASSPORT if fields is None else PASSPORT.only(fields)
+    return schema.count(passports)[1]
+
+
+def part1(passports):
+    # Presence alone needs none of the checks
+    return int(passports.have(RULES).sum())
+
+
+def part2(passports):
+    return count_valid(passports)
+
+
+def main(filename, verbose=0):
+    passports = parse(filename)
+    print(part1(passports))
+    print(part2(passports))
+    if verbose:
+        # Counted by part2
+        for field in PASSPORT.rules:
+            print(f'{field}: {PASSPORT.missing[field]} missing, '
+                  f'{PASSPORT.failures[field]} invalid')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    parser.add_argument('--verbose', '-v', action='count', default=0,
+                        help='print how many passports failed each rule')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.verbose)
@@ -1,36 +1,114 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import NEWLINE, lines, read, rstrip  # noqa: E402
+
+
+# Passes decoded at once, bounding the memory used whatever the input size
+CHUNK = 1 << 20
+RETURN = ord('\r')
+# Membership of each byte in FBLR, as one lookup per byte of a chunk
+LETTERS = np.zeros(256, bool)
+LETTERS[list(b'FBLR')] = True
 
 
 def parse(filename):
-    with open(filename) as f:
-        lines = [line.strip() for line in f.readlines()]
+    """Bitmap of the seat ids found on the boarding passes."""
+    return seat_map(read(filename))
+
+
+def seat_map(data, chunk=CHUNK):
+    data = rstrip(data)
+    if not data.size:
+        return np.zeros(1, bool)
+    newlines = np.flatnonzero(data[:64] == NEWLINE)
+    line = int(newlines[0]) if newlines.size else data.size
+    # Lines may end with \r\n, which is only checked for, not decoded
+    crlf = int(line > 0 and data[line - 1] == RETURN)
+    width = line - crlf
+    if (data.size + 1 + crlf) % (line + 1):
+        raise ValueError('Boarding passes differ in length')
+
+    # One row per pass, without copying the buffer or its newlines
+    count = (data.size + 1 + crlf) // (line + 1)
+    passes = as_strided(data, (count, width), (line + 1, 1), writeable=False)
+    separators = data[line::line + 1]
+    returns = data[width::line + 1]
+    # B and R have bit 2 clear, F and L have it set
+    weights = np.left_shift(1, np.arange(width - 1, -1, -1)).astype(
+        np.min_scalar_type((1 << width) - 1))
+    seen = np.zeros(1 << width, bool)
+    for start in range(0, count, chunk):
+        if (separators[start:start + chunk] != NEWLINE).any() or (
+                crlf and (returns[start:start + chunk] != RETURN).any()):
+            raise ValueError('Boarding passes differ in length')
+        block = passes[start:start + chunk]
+        if not LETTERS[block].all():
+            raise ValueError('Boarding passes must only hold F, B, L and R')
+        seen[(~block >> 2 & 1) @ weights] = True
 
-    return lines
+    return seen
 
 
 def get_id(bpass):
     return int(bpass.translate(''.maketrans('BRFL', '1100')), 2)
 
 
-def main(filename):
-    bpasses = parse(filename)
-    max_ = 0
-    ids = set()
-    for bp in bpasses:
+def part1(seen):
+    return int(np.flatnonzero(seen)[-1])
+
+
+def part2(seen):
+    ids = np.flatnonzero(seen)
+    free_seats = np.flatnonzero(~seen[ids[0]:ids[-1]]) + ids[0]
+    assert len(free_seats) == 1
+
+    return int(free_seats[0])
+
+
+def stream(lines):
+    """Both answers in one pass, only keeping the range and sum of the ids.
+
+    The free seat is the one missing from the sum of the whole range.
+    """
+    lowest, highest, total, count = None, None, 0, 0
+    for bp in lines:
+        if not bp:
+            continue
         id_ = get_id(bp)
-        max_ = max(max_, id_)
-        ids.add(id_)
+        lowest = id_ if lowest is None else min(lowest, id_)
+        highest = id_ if highest is None else max(highest, id_)
+        total += id_
+        count += 1
+    assert count == highest - lowest
 
-    print(f'part 1: {max_}')
+    return highest, (lowest + highest) * (count + 1) // 2 - total
 
-    sorted_ids = sorted(ids)
-    min_, max_ = sorted_ids[0], sorted_ids[-1]
-    free_seat = set(range(min_ + 1, max_)) - ids
-    assert len(free_seat) == 1
 
-    print(f'part 2: {next(iter(free_seat))}')
+def main(filename, streaming=False):
+    if streaming:
+        highest, free_seat = stream(lines(filename))
+    else:
+        seen = parse(filename)
+        highest, free_seat = part1(seen), part2(seen)
+    print(f'part 1: {highest}')
+    print(f'part 2: {free_seat}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename', help='input file, - for stdin with --stream')
+    parser.add_argument('--stream', action='store_true',
+                        help='solve while reading the input line by line')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.stream)
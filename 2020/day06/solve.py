@@ -1,55 +1,80 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import NEWLINE, read, record_chunks  # noqa: E402
+
+
+# Groups are tallied a chunk of the input at a time
+CHUNK = 1 << 24
+# Bits set in each byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], np.uint8)
 
 
 def parse(filename):
-    with open(filename) as f:
-        lines = [line.strip() for line in f.readlines()]
+    """Questions anyone, and everyone, answered yes to in each group, as
+    two arrays of bitmasks."""
+    masks = [answer_masks(chunk)
+             for chunk in record_chunks(read(filename), CHUNK)]
+    return (np.concatenate([anyone for anyone, _ in masks]),
+            np.concatenate([everyone for _, everyone in masks]))
+
+
+def answer_masks(data):
+    """Union and intersection of the answers of each group, as bitmasks
+    with bit 0 for question a."""
+    letters = (data - np.uint8(ord('a'))).astype(np.uint32)
+    bits = np.where(letters < 26, np.left_shift(1, letters, dtype=np.uint32),
+                    np.uint32(0))
 
-    groups = []
-    group = []
-    for line in lines:
-        if not line:
-            groups.append(group)
-            group = []
-        else:
-            group.append(line)
+    # One mask per person, blank lines only separate the groups
+    starts = np.concatenate(([0], np.flatnonzero(data == NEWLINE) + 1))
+    lengths = np.diff(starts, append=data.size + 1) - 1
+    person = lengths > 0
+    people = np.bitwise_or.reduceat(bits, starts[person]) if person.any() \
+        else np.zeros(0, np.uint32)
 
-    return groups
+    group = np.cumsum(~person)[person]
+    firsts = np.flatnonzero(np.diff(group, prepend=-1))
+    if not firsts.size:
+        return people, people
+    return (np.bitwise_or.reduceat(people, firsts),
+            np.bitwise_and.reduceat(people, firsts))
 
 
-def count_any_yes(groups):
-    count = 0
-    for group in groups:
-        answers = set()
-        for line in group:
-            answers |= set(line)
-        count += len(answers)
+def count_bits(masks):
+    return int(POPCOUNT[masks.view(np.uint8)].sum(dtype=np.int64))
 
-    return count
 
+def part1(masks):
+    return count_bits(masks[0])
 
-def count_unanimous_yes(groups):
-    count = 0
-    for group in groups:
-        answers = set('abcdefghijklmnopqrstuvwxyz')
-        for line in group:
-            answers &= set(line)
-        count += len(answers)
 
-    return count
+def part2(masks):
+    return count_bits(masks[1])
 
 
 def main(filename):
-    groups = parse(filename)
-    total = count_any_yes(groups)
+    masks = parse(filename)
+    total = part1(masks)
 
     print(f'part 1: {total}')
 
-    total = count_unanimous_yes(groups)
+    total = part2(masks)
 
     print(f'part 2: {total}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from collections import defaultdict, deque
+from pathlib import Path
 
 
 def parse(filename):
@@ -14,39 +17,93 @@ def parse(filename):
             inners = [i.split(' ', 1) for i in inners.split(', ')]
             rules[outer] = {i.rsplit(' ', 1)[0]: int(n) for n, i in inners}
 
-    return rules
+    return BagGraph(rules)
 
 
-def can_contain(bag, color, rules):
-    if (color in rules[bag]
-        or any(can_contain(inner_bag, color, rules)
-               for inner_bag in rules[bag])):
-        return True
-    else:
-        return False
+class BagGraph:
+    """Containment rules indexed both ways, for queries on any color.
 
+    Every query below is linear in the size of the graph, and the content
+    counts of all the bags are computed together the first time one is
+    needed.
+    """
 
-def count_content(bag, rules):
-    if not rules[bag]:
-        return 0
+    def __init__(self, rules):
+        self.rules = {bag: dict(inners) for bag, inners in rules.items()}
+        self.contained_by = defaultdict(list)
+        for outer, inners in rules.items():
+            for inner in inners:
+                self.rules.setdefault(inner, {})
+                self.contained_by[inner].append(outer)
+        self._totals = None
 
-    count = 0
-    for b, n in rules[bag].items():
-        count += n * (1 + count_content(b, rules))
-    return count
+    def __len__(self):
+        return len(self.rules)
+
+    def holders(self, color):
+        """Colors of the bags that eventually contain a ``color`` bag."""
+        seen = set()
+        queue = deque([color])
+        while queue:
+            for outer in self.contained_by.get(queue.popleft(), ()):
+                if outer not in seen:
+                    seen.add(outer)
+                    queue.append(outer)
+        return seen
+
+    def content(self, color):
+        """How many bags a ``color`` bag holds in total."""
+        if color not in self.rules:
+            raise KeyError(f'No rule for {color} bags')
+        if self._totals is None:
+            self._totals = self.count_contents()
+        if color not in self._totals:
+            raise ValueError(f'{color} bags contain themselves')
+        return self._totals[color]
+
+    def count_contents(self):
+        """Total content of every bag, from the empty ones outwards.
+
+        Bags that end up containing themselves are left out.
+        """
+        pending = {bag: len(inners) for bag, inners in self.rules.items()}
+        ready = deque(bag for bag, count in pending.items() if not count)
+        totals = {}
+        while ready:
+            bag = ready.popleft()
+            totals[bag] = sum(n * (1 + totals[inner])
+                              for inner, n in self.rules[bag].items())
+            for outer in self.contained_by.get(bag, ()):
+                pending[outer] -= 1
+                if not pending[outer]:
+                    ready.append(outer)
+        return totals
+
+
+def part1(graph):
+    return len(graph.holders('shiny gold'))
+
+
+def part2(graph):
+    return graph.content('shiny gold')
 
 
 def main(filename):
-    rules = parse(filename)
-    count = 0
-    for bag in rules:
-        if can_contain(bag, 'shiny gold', rules):
-            count += 1
+    graph = parse(filename)
+    count = part1(graph)
     print(f'part 1: {count}')
 
-    total = count_content('shiny gold', rules)
+    total = part2(graph)
     print(f'part 2: {total}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
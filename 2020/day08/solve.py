@@ -1,39 +1,209 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from array import array
+from collections import Counter, deque
+from pathlib import Path
+
+
+# Every instruction moves the pointer and adds to the accumulator, by
+# amounts its decoder works out from the operand once, when loading
+OPCODES = {}
+
+
+def opcode(name):
+    def register(decode):
+        OPCODES[name] = decode
+        return decode
+    return register
+
+
+@opcode('nop')
+def nop(operand):
+    return 1, 0
+
+
+@opcode('acc')
+def acc(operand):
+    return 1, operand
+
+
+@opcode('jmp')
+def jmp(operand):
+    return operand, 0
+
+
+class Trace:
+    """What the runs of a traced Interpreter went through.
+
+    Hits add up over runs, the rest is about the last one: the
+    instruction it looped back to, how many steps the loop takes, and its
+    last ``last`` steps as ``(ptr, acc)`` pairs before each instruction.
+    """
+
+    def __init__(self, last=16):
+        self.hits = Counter()
+        self.recent = deque(maxlen=last)
+        self.executed = 0
+        self.loop_entry = None
+        self.cycle_length = None
+
+    def hottest(self, n=10):
+        return self.hits.most_common(n)
 
 
 class Interpreter:
+    """Runs programs decoded into straight-line segments.
+
+    Instructions that move the pointer to the next one are chained until
+    the next one that jumps, and each index keeps where its segment stops
+    and what it adds to the accumulator. Running a segment is then a
+    single step, with its instructions marked as visited all at once.
+    """
+
     def __init__(self):
-        self.code = []
-        self.reset()
+        self.trace = None
+        self.load([])
 
     def reset(self):
         self.ptr = 0
         self.acc = 0
-        self.lines_executed = set()
+        self.steps = 0
+        self.visited = bytearray(len(self.code))
 
     def load(self, code):
+        """Decode ``code`` into arrays of pointer moves and increments."""
         self.code = code
-
-    def run(self):
+        self.jumps = array('q')
+        self.increments = array('q')
+        for inst, operand in code:
+            jump, increment = self.decode(inst, operand)
+            self.jumps.append(jump)
+            self.increments.append(increment)
+        # Where the segment of each instruction stops, and its total
+        self.stops = array('q', range(1, len(code) + 1))
+        self.totals = array('q', self.increments)
+        self._ones = memoryview(b'\x01' * len(code))
+        for i in reversed(range(len(code) - 1)):
+            if self.jumps[i] == 1:
+                self.stops[i] = self.stops[i + 1]
+                self.totals[i] += self.totals[i + 1]
         self.reset()
-        while self.ptr < len(self.code):
-            current, offset = self.code[self.ptr]
-            if self.ptr in self.lines_executed:
-                raise RuntimeError('Infinite loop')
-            else:
-                self.lines_executed.add(self.ptr)
-
-            self.ptr += 1
-            if current == 'nop':
-                pass
-            elif current == 'acc':
-                self.acc += offset
-            elif current == 'jmp':
-                self.ptr += offset - 1
+
+    @staticmethod
+    def decode(inst, operand):
+        try:
+            return OPCODES[inst](operand)
+        except KeyError:
+            raise ValueError(f'Unknown instruction: {inst}') from None
+
+    def _relink(self, i):
+        """Update the segments running through instruction ``i``."""
+        while True:
+            if self.jumps[i] == 1 and i + 1 < len(self.code):
+                self.stops[i] = self.stops[i + 1]
+                self.totals[i] = self.increments[i] + self.totals[i + 1]
             else:
-                raise ValueError(f'Unknown instruction: {current}')
-        return self.acc
+                self.stops[i] = i + 1
+                self.totals[i] = self.increments[i]
+            if i == 0 or self.jumps[i - 1] != 1:
+                return
+            i -= 1
+
+    def enable_trace(self, last=16):
+        """Record the steps of the next runs, one instruction at a time."""
+        self.trace = Trace(last)
+        return self.trace
+
+    def run(self, budget=None):
+        """Run the program from the start, at most ``budget`` steps."""
+        if self.trace is not None:
+            return self._run_traced(budget)
+        self.reset()
+        jumps, stops, totals = self.jumps, self.stops, self.totals
+        visited, ones = self.visited, self._ones
+        end = len(jumps)
+        limit = end + 1 if budget is None else budget
+        ptr, acc, steps = 0, 0, 0
+        try:
+            while 0 <= ptr < end:
+                stop = stops[ptr]
+                # Looping takes precedence over running out of steps
+                room = ptr + limit - steps
+                looped = visited.find(1, ptr, min(stop, room + 1))
+                last = looped if looped != -1 else min(stop, room)
+                visited[ptr:last] = ones[:last - ptr]
+                steps += last - ptr
+                if last < stop:
+                    acc += totals[ptr] - totals[last]
+                    ptr = last
+                    raise RuntimeError('Infinite loop' if looped != -1
+                                       else 'Step budget exhausted')
+                acc += totals[ptr]
+                ptr = stop - 1 + jumps[stop - 1]
+            if ptr < 0:
+                raise IndexError('Jump before the start of the program')
+        finally:
+            self.ptr, self.acc, self.steps = ptr, acc, steps
+        return acc
+
+    def _run_traced(self, budget):
+        self.reset()
+        trace = self.trace
+        trace.recent.clear()
+        trace.loop_entry = trace.cycle_length = None
+        jumps, increments, visited = self.jumps, self.increments, self.visited
+        end = len(jumps)
+        # Step at which each instruction ran, to measure loops
+        started = {}
+        ptr, acc, steps = 0, 0, 0
+        try:
+            while 0 <= ptr < end:
+                if visited[ptr]:
+                    trace.loop_entry = ptr
+                    trace.cycle_length = steps - started[ptr]
+                    raise RuntimeError('Infinite loop')
+                if steps == budget:
+                    raise RuntimeError('Step budget exhausted')
+                visited[ptr] = 1
+                started[ptr] = steps
+                trace.hits[ptr] += 1
+                trace.recent.append((ptr, acc))
+                acc += increments[ptr]
+                ptr += jumps[ptr]
+                steps += 1
+            if ptr < 0:
+                raise IndexError('Jump before the start of the program')
+        finally:
+            self.ptr, self.acc, self.steps = ptr, acc, steps
+            trace.executed += steps
+        return acc
+
+    def run_batch(self, patches, budget=None):
+        """Accumulator at the end of each patched version of the program,
+        or None for those that don't end or jump before the start.
+
+        Each patch maps instruction indices to replacement instructions,
+        applied to the decoded program for the time of one run.
+        """
+        results = []
+        for patch in patches:
+            # Segments are relinked from the end so that later ones are
+            # up to date when earlier ones are chained to them
+            indices = sorted(patch, reverse=True)
+            saved = [(self.jumps[i], self.increments[i]) for i in indices]
+            for i in indices:
+                self.jumps[i], self.increments[i] = self.decode(*patch[i])
+                self._relink(i)
+            try:
+                results.append(self.run(budget))
+            except (RuntimeError, IndexError):
+                results.append(None)
+            finally:
+                for i, (jump, increment) in zip(indices, saved):
+                    self.jumps[i], self.increments[i] = jump, increment
+                    self._relink(i)
+        return results
 
 
 def parse(filename):
@@ -46,39 +216,112 @@ def parse(filename):
     return code
 
 
-def fix_and_run(code, interpreter):
+def successors(code):
+    """Where each instruction goes next as written, and with nop and jmp
+    swapped (None for acc). Jumps out of the program all go to
+    ``len(code)``, the exit, or past it when they go backwards."""
+    end = len(code)
+
+    def target(ptr):
+        return end if ptr >= end else ptr if ptr >= 0 else end + 1
+
+    nexts, swapped = [], []
     for i, (inst, offset) in enumerate(code):
-        fixed_code = list(code)
-        if inst == 'nop':
-            fixed_code[i] = ('jmp', offset)
-        elif inst == 'jmp':
-            fixed_code[i] = ('nop', offset)
-        else:
-            continue
-
-        interpreter.load(fixed_code)
-        try:
-            acc = interpreter.run()
-        except RuntimeError:
-            continue
-        else:
-            return acc
+        nexts.append(target(i + offset) if inst == 'jmp' else i + 1)
+        swapped.append(target(i + offset) if inst == 'nop'
+                       else i + 1 if inst == 'jmp' else None)
+    return nexts, swapped
 
 
-def main(filename):
-    interpreter = Interpreter()
-    code = parse(filename)
+def repair(code):
+    """Index of the instruction to swap between nop and jmp so that the
+    program ends, and the accumulator it ends with.
+
+    The instructions that lead to the exit are marked walking the control
+    flow graph backwards from it, so that the single trace of the broken
+    program only has to look for a swap landing on one of them.
+    """
+    end = len(code)
+    nexts, swapped = successors(code)
+    came_from = [[] for _ in range(end + 2)]
+    for i, next_ in enumerate(nexts):
+        came_from[next_].append(i)
+
+    exits = bytearray(end + 2)
+    exits[end] = 1
+    stack = [end]
+    while stack:
+        for i in came_from[stack.pop()]:
+            if not exits[i]:
+                exits[i] = 1
+                stack.append(i)
+
+    ptr, acc = 0, 0
+    seen = bytearray(end)
+    while ptr < end and not seen[ptr]:
+        seen[ptr] = 1
+        target = swapped[ptr]
+        if target is not None and exits[target]:
+            fixed, ptr = ptr, target
+            break
+        acc += code[ptr][1] if code[ptr][0] == 'acc' else 0
+        ptr = nexts[ptr]
+    else:
+        raise ValueError('No single swap ends the program')
+
+    # Everything from there on was marked as leading to the exit
+    while ptr < end:
+        acc += code[ptr][1] if code[ptr][0] == 'acc' else 0
+        ptr = nexts[ptr]
+    return fixed, acc
+
+
+def part1(code, interpreter=None):
+    interpreter = interpreter or Interpreter()
     interpreter.load(code)
 
     try:
         interpreter.run()
     except RuntimeError:
-        print(f'Step 1: {interpreter.acc}')
+        return interpreter.acc
 
-    acc = fix_and_run(code, interpreter)
-    print(f'Step 2: {acc}')
 
+def part2(code):
+    return repair(code)[1]
+
+
+def show_trace(trace, code):
+    print(f'{trace.executed} instructions executed')
+    if trace.loop_entry is not None:
+        print(f'loops back to {trace.loop_entry} '
+              f'every {trace.cycle_length} instructions')
+    for ptr, acc in trace.recent:
+        inst, operand = code[ptr]
+        print(f'{ptr:>6}: {inst} {operand:+d}  acc={acc}')
+
+
+def main(filename, trace=0):
+    code = parse(filename)
+    interpreter = Interpreter()
+    if trace:
+        interpreter.enable_trace(trace)
+    print(f'Step 1: {part1(code, interpreter)}')
+    if trace:
+        show_trace(interpreter.trace, code)
+
+    acc = part2(code)
+    print(f'Step 2: {acc}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    parser.add_argument('--trace', type=int, default=0, metavar='N',
+                        help='show how part 1 loops and its last N steps')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.trace)
@@ -1,46 +1,166 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from collections import deque
+from itertools import accumulate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import ints, lines, read  # noqa: E402
 
 
 def parse(filename):
-    with open(filename) as f:
-        return [int(line) for line in f.readlines()]
+    return ints(read(filename)).tolist()
+
+
+class Window:
+    """The last ``size`` numbers, and how many pairs of them add up to
+    each sum.
+
+    Numbers are counted rather than stored in a set, so that a number can
+    be the sum of two equal ones, and each one coming in or going out
+    only updates the sums it takes part in.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque()
+        self.counts = {}
+        self.sums = {}
 
+    def __len__(self):
+        return len(self.values)
 
-def validate(n, ancestors):
-    ancestors = set(ancestors)
-    for i in ancestors:
-        if n - i != n and (n - i) in ancestors:
-            return True
-    return False
+    def is_sum(self, n):
+        return n in self.sums
+
+    def push(self, n):
+        if len(self.values) == self.size:
+            self.pop()
+        sums = self.sums
+        for value, count in self.counts.items():
+            sums[n + value] = sums.get(n + value, 0) + count
+        self.counts[n] = self.counts.get(n, 0) + 1
+        self.values.append(n)
+
+    def pop(self):
+        n = self.values.popleft()
+        counts, sums = self.counts, self.sums
+        if counts[n] == 1:
+            del counts[n]
+        else:
+            counts[n] -= 1
+        # Sums no pair adds up to anymore are dropped
+        for value, count in counts.items():
+            left = sums[n + value] - count
+            if left:
+                sums[n + value] = left
+            else:
+                del sums[n + value]
+        return n
+
+
+def invalid_numbers(numbers, size):
+    """Numbers that aren't the sum of two of the ``size`` before them."""
+    window = Window(size)
+    for n in numbers:
+        if len(window) == size and not window.is_sum(n):
+            yield n
+        window.push(n)
 
 
 def find_invalid(buf, size):
-    for i in range(size, len(buf)):
-        if not validate(buf[i], buf[i - size:i]):
-            return buf[i]
+    return next(invalid_numbers(buf, size), None)
+
 
+def find_weakness(buf, target):
+    """Start and end of the first range of at least two numbers adding up
+    to ``target``, and the sum of its smallest and largest numbers."""
+    if buf and min(buf) < 0:
+        return prefix_search(buf, target)
 
-def bruteforce(buf, target):
-    for i in range(len(buf) - 1):
-        for j in range(i + 2, len(buf) + 1):
-            if sum(buf[i:j]) == target:
-                return min(buf[i:j]) + max(buf[i:j])
-    return -1
+    # Without negative numbers, growing the range only grows its sum
+    mins, maxs = deque(), deque()
+    start, total = 0, 0
+    for end, n in enumerate(buf, 1):
+        total += n
+        while mins and buf[mins[-1]] >= n:
+            mins.pop()
+        mins.append(end - 1)
+        while maxs and buf[maxs[-1]] <= n:
+            maxs.pop()
+        maxs.append(end - 1)
 
+        while total > target and end - start > 1:
+            total -= buf[start]
+            start += 1
+            if mins[0] < start:
+                mins.popleft()
+            if maxs[0] < start:
+                maxs.popleft()
+        if total == target and end - start > 1:
+            return start, end, buf[mins[0]] + buf[maxs[0]]
+    return None
+
+
+def prefix_search(buf, target):
+    """Same as find_weakness with any numbers, going through the sums of
+    all the prefixes."""
+    prefixes = list(accumulate(buf, initial=0))
+    # Going backwards, the closest end at least two numbers away at which
+    # each prefix sum is reached
+    closest = {}
+    found = None
+    for start in range(len(buf) - 2, -1, -1):
+        closest[prefixes[start + 2]] = start + 2
+        end = closest.get(prefixes[start] + target)
+        if end is not None:
+            found = start, end
+    if found is None:
+        return None
+
+    start, end = found
+    low = high = buf[start]
+    for i in range(start + 1, end):
+        low, high = min(low, buf[i]), max(high, buf[i])
+    return start, end, low + high
+
+
+def part1(buf, size=25):
+    return find_invalid(buf, size)
+
+
+def part2(buf, size=25):
+    target = find_invalid(buf, size)
+    if target is None:
+        return -1
+    found = find_weakness(buf, target)
+    return found[2] if found else -1
+
+
+def main(filename, size, streaming=False):
+    if streaming:
+        numbers = (int(line) for line in lines(filename) if line)
+        print(f'Step 1: {find_invalid(numbers, size)}')
+        return
 
-def main(filename, size):
     buf = parse(filename)
-    bad_n = find_invalid(buf, size)
+    bad_n = part1(buf, size)
     print(f'Step 1: {bad_n}')
 
-    weakness = bruteforce(buf, bad_n)
+    weakness = part2(buf, size)
     print(f'Step 2: {weakness}')
 
 
 if __name__ == '__main__':
-    try:
-        size = int(sys.argv[2])
-    except IndexError:
-        size = 25
-    main(sys.argv[1], size)
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename', help='input file, - for stdin with --stream')
+    parser.add_argument('size', nargs='?', type=int, default=25)
+    parser.add_argument('--stream', action='store_true',
+                        help='check numbers while reading them, part 1 only')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.size, args.stream)
@@ -1,70 +1,71 @@
 #!/usr/bin/env python
 import sys
-from collections import defaultdict
-from dataclasses import dataclass
-from functools import lru_cache
-from typing import List
+from argparse import ArgumentParser
+from collections import Counter, deque
+from pathlib import Path
+from typing import List, Tuple
 
 
-@dataclass
-class Node:
-    value: int
-    next: List['Node']
-
-    def __hash__(self):
-        return hash(self.value)
-
+def parse(filename: str) -> List[int]:
+    with open(filename) as f:
+        return sorted(int(line) for line in f.readlines())
 
-@dataclass
-class Dag:
-    start: Node
-    end: Node
 
-    @classmethod
-    def from_list(cls, chain: List[int]) -> 'Dag':
-        nodes = [Node(v, []) for v in chain]
-        dag = cls(nodes[0], nodes[-1])
-        for i in range(len(nodes)):
-            for j in range(i + 1, len(nodes)):
-                if nodes[j].value - nodes[i].value > 3:
-                    break
-                nodes[i].next.append(nodes[j])
+def chain(adapters: List[int], max_gap: int = 3) -> Tuple[Counter, int]:
+    """Differences between successive joltages from the outlet to the
+    device, ``max_gap`` jolts above the largest adapter, and how many
+    arrangements of the adapters connect them.
 
-        return dag
+    Arrangements are counted in one pass over the sorted joltages, only
+    keeping the ones still within ``max_gap`` of the current one with
+    the number of ways to reach them.
+    """
+    joltages = [*adapters, (adapters[-1] if adapters else 0) + max_gap]
+    differences = Counter()
+    window = deque([(0, 1)])
+    reaching = 1
+    previous = 0
+    for joltage in joltages:
+        differences[joltage - previous] += 1
+        previous = joltage
+        while window and joltage - window[0][0] > max_gap:
+            reaching -= window.popleft()[1]
+        ways = reaching
+        window.append((joltage, ways))
+        reaching += ways
 
+    return differences, window[-1][1]
 
-def parse(filename: str) -> List[int]:
-    with open(filename) as f:
-        return sorted(int(line) for line in f.readlines())
 
+def part1(adapters: List[int], max_gap: int = 3) -> int:
+    differences, _ = chain(adapters, max_gap)
+    return differences[1] * differences[3]
 
-@lru_cache
-def dfs(start: Node, end: Node) -> int:
-    if start is end:
-        return 1
 
-    return sum(dfs(node, end) for node in start.next)
+def part2(adapters: List[int], max_gap: int = 3) -> int:
+    _, arrangements = chain(adapters, max_gap)
+    return arrangements
 
 
-def main(filename: str) -> None:
+def main(filename: str, max_gap: int = 3) -> None:
     adapters = parse(filename)
 
-    # Add outlet and device to chain
-    chain = [0] + adapters + [adapters[-1] + 3]
-
-    # Count successive difference in chain
-    diff = defaultdict(int)
-    for prev, curr in zip(chain[:-1], chain[1:]):
-        diff[curr - prev] += 1
-
-    # Compute puzzle output
-    res = diff[1] * diff[3]
+    res = part1(adapters, max_gap)
     print(f'Step 1: {res}')
 
-    dag = Dag.from_list(chain)
-    paths = dfs(dag.start, dag.end)
+    paths = part2(adapters, max_gap)
     print(f'Step 2: {paths}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    parser.add_argument('--max-gap', type=int, default=3,
+                        help='largest joltage difference an adapter takes')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.max_gap)
@@ -1,97 +1,202 @@
 #!/usr/bin/env python
 import sys
-from copy import deepcopy
-from operator import methodcaller
-from typing import List
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
 
+import numpy as np
 
-EMPTY, OCCUPIED = 'L', '#'
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.grid import NEIGHBORS8, Grid, neighbor_views  # noqa: E402
+
+
+FLOOR, EMPTY, OCCUPIED = b'.L#'
 ADJACENT, SIGHT = range(2)
 
 
 class CellularAutomata:
-    deltas = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+    """Seats of a grid and whether they are occupied, floor left out.
+
+    Seats are numbered in row-major order and the neighbors each strategy
+    looks at are found once, as an ``(8, seats)`` array of their numbers.
+    Missing neighbors point to an extra seat past the last one which is
+    never occupied, so that a step is a gather and a sum.
+    """
+    deltas = NEIGHBORS8
 
-    def __init__(self, grid: List[List[str]], strat: int, threshold: int) -> None:
+    def __init__(self, grid: Grid, strat: int, threshold: int) -> None:
         self.grid = grid
-        self.neighbors = [[0] * len(grid[0]) for _ in range(len(grid))]
+        self.seats = grid.cells != FLOOR
         self.threshold = threshold
-        self.heigh = len(self.grid)
-        self.width = len(self.grid[0])
+        self.positions = np.flatnonzero(self.seats)
+        self.numbers = np.full(grid.shape, len(self.positions), np.int32)
+        self.numbers[self.seats] = np.arange(len(self.positions))
         if strat == ADJACENT:
-            self.recount_neighbors = self.count_adjacent_neighbors
+            self.neighbors = self.adjacent_neighbors()
         elif strat == SIGHT:
-            self.recount_neighbors = self.count_visible_neighbors
+            self.neighbors = self.visible_neighbors()
         else:
             raise ValueError('Unknown strategy')
+        self.occupied = np.zeros(len(self.positions) + 1, bool)
+        self.occupied[:-1] = grid.cells.ravel()[self.positions] == OCCUPIED
 
     @classmethod
     def from_file(cls, filename: str, strat: int, threshold: int) -> 'CellularAutomata':
-        with open(filename) as f:
-            return cls([list(line.strip()) for line in f.readlines()], strat, threshold)
+        return cls(parse(filename), strat, threshold)
 
     def step(self) -> int:
-        changes = 0
-        for y in range(self.heigh):
-            for x in range(self.width):
-                if self.grid[y][x] == EMPTY and self.neighbors[y][x] == 0:
-                    self.grid[y][x] = OCCUPIED
-                    changes += 1
-                elif self.grid[y][x] == OCCUPIED and self.neighbors[y][x] >= self.threshold:
-                    self.grid[y][x] = EMPTY
-                    changes += 1
-        self.recount_neighbors()
+        neighbors = self.count_neighbors()
+        occupied = self.occupied[:-1]
+        following = np.where(occupied, neighbors < self.threshold,
+                             neighbors == 0)
+        changes = int(np.count_nonzero(following != occupied))
+        occupied[:] = following
         return changes
 
-    def count_adjacent_neighbors(self) -> None:
-        for y in range(self.heigh):
-            for x in range(self.width):
-                self.neighbors[y][x] = 0
-                for r, c in self.deltas:
-                    y2, x2 = y + r, x + c
-                    if (0 <= y2 < self.heigh and 0 <= x2 < self.width
-                            and self.grid[y2][x2] == OCCUPIED):
-                        self.neighbors[y][x] += 1
-
-    def count_visible_neighbors(self) -> None:
-        for y in range(self.heigh):
-            for x in range(self.width):
-                self.neighbors[y][x] = 0
-                for r, c in self.deltas:
-                    y2, x2 = y + r, x + c
-                    while 0 <= y2 < self.heigh and 0 <= x2 < self.width:
-                        if self.grid[y2][x2] == OCCUPIED:
-                            self.neighbors[y][x] += 1
-                            break
-                        elif self.grid[y2][x2] == EMPTY:
-                            break
-                        y2 += r
-                        x2 += c
-
-    def count(self, state):
-        return sum(map(methodcaller('count', state), self.grid))
+    def settle_frontier(self) -> List[int]:
+        """Run until stable, only looking at seats next to ones that just
+        changed, and return how many were looked at on each step."""
+        missing = len(self.positions)
+        occupied = self.occupied
+        frontier = np.arange(missing)
+        frontiers = []
+        while frontier.size:
+            frontiers.append(frontier.size)
+            neighbors = self.count_neighbors(frontier)
+            before = occupied[frontier]
+            after = np.where(before, neighbors < self.threshold,
+                             neighbors == 0)
+            flipped = after != before
+            changed = frontier[flipped]
+            occupied[changed] = after[flipped]
+
+            marked = np.zeros(missing + 1, bool)
+            marked[self.neighbors[:, changed]] = True
+            marked[changed] = True
+            frontier = np.flatnonzero(marked[:-1])
+        return frontiers
+
+    def count_neighbors(self, seats: Optional[np.ndarray] = None) -> np.ndarray:
+        """Occupied neighbors of the given seats, or of all of them."""
+        numbers = self.neighbors if seats is None else self.neighbors[:, seats]
+        # One direction at a time, which gathers from contiguous rows
+        occupied = self.occupied.view(np.uint8)
+        neighbors = np.take(occupied, numbers[0])
+        for row in numbers[1:]:
+            neighbors += np.take(occupied, row)
+        return neighbors
+
+    def adjacent_neighbors(self) -> np.ndarray:
+        missing = len(self.positions)
+        views = neighbor_views(self.numbers, self.deltas, missing)
+        return np.stack([view[self.seats] for view in views])
+
+    def visible_neighbors(self) -> np.ndarray:
+        h, w = self.seats.shape
+        missing = len(self.positions)
+        seats = np.pad(self.seats, 1)
+        numbers = np.pad(self.numbers, 1, constant_values=missing)
+        neighbors = []
+        for dy, dx in self.deltas:
+            # Number of the first seat seen from each cell, built up one
+            # line at a time going against the direction looked in
+            visible = np.full_like(numbers, missing)
+            if dx:
+                columns = range(w, 0, -1) if dx > 0 else range(1, w + 1)
+                for x in columns:
+                    rows = slice(1 + dy, h + 1 + dy)
+                    visible[1:-1, x] = np.where(seats[rows, x + dx],
+                                                numbers[rows, x + dx],
+                                                visible[rows, x + dx])
+            else:
+                for y in range(h, 0, -1) if dy > 0 else range(1, h + 1):
+                    visible[y, 1:-1] = np.where(seats[y + dy, 1:-1],
+                                                numbers[y + dy, 1:-1],
+                                                visible[y + dy, 1:-1])
+            neighbors.append(visible[1:-1, 1:-1][self.seats])
+        return np.stack(neighbors)
+
+    def update_grid(self) -> None:
+        """Write the occupied seats back into the grid."""
+        self.grid.cells.ravel()[self.positions] = np.where(
+            self.occupied[:-1], OCCUPIED, EMPTY)
+
+    def count(self, state: int) -> int:
+        self.update_grid()
+        return int(np.count_nonzero(self.grid.cells == state))
 
     def __str__(self) -> str:
-        return '\n'.join(''.join(row) for row in self.grid)
+        self.update_grid()
+        return str(self.grid)
 
 
-def main(filename: str) -> None:
-    ca = CellularAutomata.from_file(filename, ADJACENT, 4)
-    changes = 1
-    while changes:
-        changes = ca.step()
+def parse(filename: str) -> Grid:
+    return Grid.from_chars(filename)
 
-    occupied = ca.count(OCCUPIED)
-    print(f'Step 1: {occupied}')
 
-    ca = CellularAutomata.from_file(filename, SIGHT, 5)
+def settle(ca: CellularAutomata,
+           incremental: bool = False) -> Tuple[int, List[int]]:
+    """Occupied seats once stable, and how many seats were looked at on
+    each step."""
+    if incremental:
+        frontiers = ca.settle_frontier()
+        return ca.count(OCCUPIED), frontiers
+
+    frontiers = []
     changes = 1
     while changes:
+        frontiers.append(len(ca.positions))
         changes = ca.step()
 
-    occupied = ca.count(OCCUPIED)
+    return ca.count(OCCUPIED), frontiers
+
+
+def part1(grid: Grid,
+          incremental: bool = False,
+          stats: bool = False) -> Union[int, Tuple[int, List[int]]]:
+    """Occupied seats, along with the steps taken with ``stats``."""
+    occupied, frontiers = settle(CellularAutomata(grid.copy(), ADJACENT, 4),
+                                 incremental)
+    return (occupied, frontiers) if stats else occupied
+
+
+def part2(grid: Grid,
+          incremental: bool = False,
+          stats: bool = False) -> Union[int, Tuple[int, List[int]]]:
+    """Occupied seats, along with the steps taken with ``stats``."""
+    occupied, frontiers = settle(CellularAutomata(grid.copy(), SIGHT, 5),
+                                 incremental)
+    return (occupied, frontiers) if stats else occupied
+
+
+def show_frontiers(frontiers: List[int]) -> None:
+    print(f'{len(frontiers)} steps, seats looked at: '
+          + ' '.join(map(str, frontiers)), file=sys.stderr)
+
+
+def main(filename: str, incremental: bool = False) -> None:
+    grid = parse(filename)
+
+    occupied, frontiers = part1(grid, incremental, stats=True)
+    if incremental:
+        show_frontiers(frontiers)
+    print(f'Step 1: {occupied}')
+
+    occupied, frontiers = part2(grid, incremental, stats=True)
+    if incremental:
+        show_frontiers(frontiers)
     print(f'Step 2: {occupied}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    parser.add_argument('--incremental', action='store_true',
+                        help='only update seats next to ones that changed, '
+                        'showing how many on stderr')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.incremental)
@@ -1,79 +1,99 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Tuple
 
 import numpy as np
 
 
-cos = lambda a: int(np.cos(np.deg2rad(a)))
-sin = lambda a: int(np.sin(np.deg2rad(a)))
-
-CMD1 = {
-    'N': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, n],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
-    'S': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, -n],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
-    'E': lambda n: np.array([[1, 0, 0, 0, n],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
-    'W': lambda n: np.array([[1, 0, 0, 0, -n],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
-    'L': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, cos(n), -sin(n), 0],
-                             [0, 0, sin(n), cos(n), 0],
-                             [0, 0, 0, 0, 1]]),
-    'R': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, cos(n), sin(n), 0],
-                             [0, 0, -sin(n), cos(n), 0],
-                             [0, 0, 0, 0, 1]]),
-    'F': lambda n: np.array([[1, 0, n, 0, 0],
-                             [0, 1, 0, n, 0],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
+# Transforms act on x, y, east/west, north/south, 1 and either move the
+# ship itself or the waypoint it follows with N, S, E and W
+SHIP, WAYPOINT = range(2)
+START = {
+    SHIP: (0, 0, 1, 0, 1),
+    WAYPOINT: (0, 0, 10, 1, 1),
 }
+DIRECTIONS = {'N': (0, 1), 'S': (0, -1), 'E': (1, 0), 'W': (-1, 0)}
+# Cosine and sine of 0, 90, 180 and 270 degrees
+RIGHT_ANGLES = ((1, 0), (0, 1), (-1, 0), (0, -1))
 
-# Only the translation matrices (N, S, E, W) are changed to alter the waypoint
-CMD2 = dict(CMD1)
-CMD2.update({
-    'N': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, n],
-                             [0, 0, 0, 0, 1]]),
-    'S': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, 1, 0, 0],
-                             [0, 0, 0, 1, -n],
-                             [0, 0, 0, 0, 1]]),
-    'E': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, 1, 0, n],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
-    'W': lambda n: np.array([[1, 0, 0, 0, 0],
-                             [0, 1, 0, 0, 0],
-                             [0, 0, 1, 0, -n],
-                             [0, 0, 0, 1, 0],
-                             [0, 0, 0, 0, 1]]),
-})
-
-
-def manhattan(coord: np.ndarray) -> int:
-    return (np.abs(coord[0]) + np.abs(coord[1]))[0]
+
+@lru_cache(maxsize=1024)
+def transform(cmd: str, n: int, moves: int = SHIP) -> np.ndarray:
+    matrix = np.eye(5, dtype=np.int64)
+    if cmd in DIRECTIONS:
+        dx, dy = DIRECTIONS[cmd]
+        row = 0 if moves == SHIP else 2
+        matrix[row:row + 2, 4] = dx * n, dy * n
+    elif cmd in ('L', 'R'):
+        if n % 90:
+            raise ValueError(f'Not a right angle: {n}')
+        cos, sin = RIGHT_ANGLES[(n if cmd == 'L' else -n) // 90 % 4]
+        matrix[2:4, 2:4] = (cos, -sin), (sin, cos)
+    elif cmd == 'F':
+        matrix[0, 2] = matrix[1, 3] = n
+    else:
+        raise ValueError(f'Unknown instruction: {cmd}')
+    matrix.flags.writeable = False
+    return matrix
+
+
+def transforms(nav_plan: List[Tuple[str, int]], moves: int) -> np.ndarray:
+    """Stack of the transforms of a plan, looking each distinct
+    instruction up once."""
+    numbers = {}
+    indices = [numbers.setdefault(step, len(numbers)) for step in nav_plan]
+    table = [transform(cmd, n, moves) for cmd, n in numbers]
+    if not table:
+        return np.zeros((0, 5, 5), np.int64)
+    return np.stack(table)[indices]
+
+
+def compose(matrices: np.ndarray) -> np.ndarray:
+    """Product of each stack of transforms on the axis before the matrix
+    ones, each transform applied after the ones before it.
+
+    Neighbors are multiplied pairwise until one is left, which takes a
+    logarithmic number of batched products.
+    """
+    *batch, n, _, _ = matrices.shape
+    if not n:
+        return np.broadcast_to(np.eye(5, dtype=np.int64), (*batch, 5, 5))
+    while n > 1:
+        if n % 2:
+            identity = np.broadcast_to(np.eye(5, dtype=matrices.dtype),
+                                       (*batch, 1, 5, 5))
+            matrices = np.concatenate([matrices, identity], axis=-3)
+        matrices = matrices[..., 1::2, :, :] @ matrices[..., ::2, :, :]
+        n = matrices.shape[-3]
+    return matrices[..., 0, :, :]
+
+
+def manhattan(coord: np.ndarray) -> np.ndarray:
+    return np.abs(coord[..., 0]) + np.abs(coord[..., 1])
+
+
+def navigate(nav_plan: List[Tuple[str, int]],
+             moves: int = SHIP) -> Tuple[Tuple[int, int], int]:
+    """Where the ship ends up, and how far it is from where it started."""
+    coord = compose(transforms(nav_plan, moves)) @ START[moves]
+    return (int(coord[0]), int(coord[1])), int(manhattan(coord))
+
+
+def navigate_all(nav_plans: List[List[Tuple[str, int]]],
+                 moves: int = SHIP) -> Tuple[np.ndarray, np.ndarray]:
+    """Final positions and distances of many plans, computed together.
+
+    Shorter plans are padded with instructions that change nothing.
+    """
+    length = max(map(len, nav_plans), default=0)
+    padded = [plan + [('F', 0)] * (length - len(plan)) for plan in nav_plans]
+    matrices = transforms([step for plan in padded for step in plan], moves)
+    matrices = matrices.reshape(len(nav_plans), length, 5, 5)
+    coords = compose(matrices) @ START[moves]
+    return coords[:, :2], manhattan(coords)
 
 
 def parse(filename: str) -> List[Tuple[str, int]]:
@@ -81,22 +101,31 @@ def parse(filename: str) -> List[Tuple[str, int]]:
         return [(line[0], int(line[1:])) for line in f.readlines()]
 
 
+def part1(nav_plan: List[Tuple[str, int]]) -> int:
+    return navigate(nav_plan, SHIP)[1]
+
+
+def part2(nav_plan: List[Tuple[str, int]]) -> int:
+    return navigate(nav_plan, WAYPOINT)[1]
+
+
 def main(filename: str) -> None:
     nav_plan = parse(filename)
-    # x, y, east/west, north/south, 1
-    coord = np.array([0, 0, 1, 0, 1]).reshape(5, 1)
-    for cmd, n in nav_plan:
-        coord = CMD1[cmd](n).dot(coord)
-    dist = manhattan(coord)
+
+    dist = part1(nav_plan)
     print(f'Step 1: {dist}')
 
-    # x, y, east/west, north/south, 1
-    coord = np.array([0, 0, 10, 1, 1]).reshape(5, 1)
-    for cmd, n in nav_plan:
-        coord = CMD2[cmd](n).dot(coord)
-    dist = manhattan(coord)
+    dist = part2(nav_plan)
     print(f'Step 2: {dist}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,9 +1,13 @@
 #!/usr/bin/env python
 import sys
-from functools import partial
-from operator import itemgetter
+from argparse import ArgumentParser
+from functools import reduce
+from math import gcd
+from pathlib import Path
 from typing import List, Tuple
 
+import numpy as np
+
 
 def parse(filename: str) -> Tuple[int, List[str]]:
     with open(filename) as f:
@@ -12,33 +16,64 @@ def parse(filename: str) -> Tuple[int, List[str]]:
     return int(inp[0]), [bus for bus in inp[1].split(',')]
 
 
-def next_eta(now: int, bus: int) -> int:
-    return (bus - (now % bus)) % bus
+def next_eta(now: int, bus_ids: np.ndarray) -> np.ndarray:
+    """Minutes to wait from ``now`` for each bus."""
+    return -now % bus_ids
+
+
+def merge(first: Tuple[int, int], second: Tuple[int, int]) -> Tuple[int, int]:
+    """Residue and modulus of the times that are ``r1`` modulo ``m1`` and
+    ``r2`` modulo ``m2``, which don't need to be coprime."""
+    (r1, m1), (r2, m2) = first, second
+    # Everything is worked out modulo m2, which stays small as the
+    # schedule is merged one bus at a time
+    diff = (r2 - r1) % m2
+    base = m1 % m2
+    g = gcd(base, m2)
+    if diff % g:
+        raise ValueError('The buses never line up')
+    # m1 * k = r2 - r1 modulo m2, divided through by g to invert m1
+    step = m2 // g
+    k = diff // g * pow(base // g, -1, step) % step
+    return r1 + m1 * k, m1 * step
 
 
 def sync_time(cond: List[Tuple[int, int]]) -> int:
-    t = 0
-    increment = 1
-    for i, bus in cond:
-        while (t + i) % bus:
-            t += increment
-        increment *= bus
-    return t
+    """First time at which each bus leaves its offset after it, by the
+    Chinese remainder theorem."""
+    return reduce(merge, [(-i % bus, bus) for i, bus in cond], (0, 1))[0]
+
+
+def part1(notes: Tuple[int, List[str]]) -> int:
+    now, buses = notes
+    bus_ids = np.array([int(bus) for bus in buses if bus != 'x'])
+    waits = next_eta(now, bus_ids)
+    first = np.argmin(waits)
+    return int(bus_ids[first] * waits[first])
+
+
+def part2(notes: Tuple[int, List[str]]) -> int:
+    _, buses = notes
+    return sync_time([(i, int(bus))
+                      for i, bus in enumerate(buses)
+                      if bus != 'x'])
 
 
 def main(filename: str) -> None:
-    now, buses = parse(filename)
-    bus_ids = list(map(int, filter(lambda b: b != 'x', buses)))
-    next_bus, wait = min(zip(bus_ids,
-                             map(partial(next_eta, now), bus_ids)),
-                         key=itemgetter(1))
-    print(f'Step 1: {next_bus * wait}')
-
-    t = sync_time([(i, int(bus))
-                   for i, bus in enumerate(buses)
-                   if bus != 'x'])
+    notes = parse(filename)
+    print(f'Step 1: {part1(notes)}')
+
+    t = part2(notes)
     print(f'Step 2: {t}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 import re
 import sys
+from argparse import ArgumentParser
 from itertools import product
 from collections import defaultdict, namedtuple
+from pathlib import Path
 from typing import List, Tuple
 
 
@@ -49,19 +51,35 @@ def init2(mem: dict, prog: List[Instruction]) -> None:
             raise RuntimeError(f'Illegal instruction "{inst.cmd}!"')
 
 
-def main(filename: str) -> None:
-    prog = parse(filename)
-
+def part1(prog: List[Instruction]) -> int:
     mem = defaultdict(int)
     init(mem, prog)
-    total = sum(mem.values())
-    print(f'Step 1: {total}')
+    return sum(mem.values())
 
+
+def part2(prog: List[Instruction]) -> int:
     mem = defaultdict(int)
     init2(mem, prog)
-    total = sum(mem.values())
+    return sum(mem.values())
+
+
+def main(filename: str) -> None:
+    prog = parse(filename)
+
+    total = part1(prog)
+    print(f'Step 1: {total}')
+
+    total = part2(prog)
     print(f'Step 2: {total}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from pathlib import Path
 from typing import List
 
 
@@ -24,15 +26,31 @@ def play(init_sequence: List[int], stop: int) -> int:
     return n
 
 
+def part1(numbers: List[int]) -> int:
+    return play(numbers, 2020)
+
+
+def part2(numbers: List[int]) -> int:
+    return play(numbers, 30000000)
+
+
 def main(filename: str) -> None:
     numbers = parse(filename)
 
-    n = play(numbers, 2020)
+    n = part1(numbers)
     print(f'Step 1: {n}')
 
-    n = play(numbers, 30000000)
+    n = part2(numbers)
     print(f'Step 2: {n}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
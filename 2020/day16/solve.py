@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
 from math import prod
+from pathlib import Path
 from typing import List, Tuple
 
 
@@ -73,22 +75,43 @@ def guess_fields(tickets: List[List[int]], fields: List[Field]) -> List[str]:
     return [name.pop() for name in order]
 
 
-def main(filename: str) -> None:
-    fields, my_ticket, tickets = parse(filename)
+def part1(notes: Tuple[List[Field], List[int], List[List[int]]]) -> int:
+    fields, _, tickets = notes
 
     error_rate = 0
     for ticket in tickets:
         error_rate += validate(ticket, fields)[1]
-    print(f'Step 1: {error_rate}')
+    return error_rate
+
+
+def part2(notes: Tuple[List[Field], List[int], List[List[int]]]) -> int:
+    fields, my_ticket, tickets = notes
 
     tickets = list(filter(lambda t: validate(t, fields)[0], tickets))
     field_names = guess_fields(tickets, fields)
 
-    total = prod(my_ticket[i]
-                 for i, name in enumerate(field_names)
-                 if name.startswith('departure'))
+    return prod(my_ticket[i]
+                for i, name in enumerate(field_names)
+                if name.startswith('departure'))
+
+
+def main(filename: str) -> None:
+    notes = parse(filename)
+
+    error_rate = part1(notes)
+    print(f'Step 1: {error_rate}')
+
+    total = part2(notes)
     print(f'Step 2: {total}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
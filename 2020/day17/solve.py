@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
 from collections import defaultdict
 from itertools import product
+from pathlib import Path
 from typing import Set, Tuple
 
 
-def parse(filename: str, d: int) -> Set[Tuple[int, ...]]:
+def parse(filename: str, d: int = 2) -> Set[Tuple[int, ...]]:
     cubes = set()
     with open(filename) as f:
         for y, line in enumerate(f.readlines()):
@@ -31,17 +33,34 @@ def step(cubes: Set[Tuple[int, ...]], d: int) -> Set[Tuple[int, ...]]:
     return new_cubes
 
 
-def main(filename: str) -> None:
-    cubes = parse(filename, 3)
-    for _ in range(6):
-        cubes = step(cubes, 3)
-    print(f'Step 1: {len(cubes)}')
+def boot(cubes: Set[Tuple[int, ...]], d: int, cycles: int = 6) -> int:
+    cubes = {c + (0,) * (d - len(c)) for c in cubes}
+    for _ in range(cycles):
+        cubes = step(cubes, d)
+    return len(cubes)
+
+
+def part1(cubes: Set[Tuple[int, ...]]) -> int:
+    return boot(cubes, 3)
+
 
-    cubes = parse(filename, 4)
-    for _ in range(6):
-        cubes = step(cubes, 4)
-    print(f'Step 2: {len(cubes)}')
+def part2(cubes: Set[Tuple[int, ...]]) -> int:
+    return boot(cubes, 4)
+
+
+def main(filename: str) -> None:
+    cubes = parse(filename)
+    print(f'Step 1: {part1(cubes)}')
+    print(f'Step 2: {part2(cubes)}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
 from dataclasses import dataclass
 from enum import auto, Enum
+from pathlib import Path
 from typing import Any, Iterable, List, Union
 
 
@@ -255,19 +257,35 @@ class Interpreter:
         return self.visit(self.ast)
 
 
-def main(filename: str):
-    lexer = Lexer.from_file(filename)
+def parse(filename: str) -> Lexer:
+    return Lexer.from_file(filename)
+
 
+def part1(lexer: Lexer) -> int:
     parser = ParserBasic(lexer)
     interpreter = Interpreter(parser.parse())
-    res = interpreter.run()
-    print(f'Step 1: {sum(res)}')
+    return sum(interpreter.run())
+
 
+def part2(lexer: Lexer) -> int:
     parser = ParserAdvanced(lexer)
     interpreter = Interpreter(parser.parse())
-    res = interpreter.run()
-    print(f'Step 2: {sum(res)}')
+    return sum(interpreter.run())
+
+
+def main(filename: str):
+    lexer = parse(filename)
+    print(f'Step 1: {part1(lexer)}')
+    print(f'Step 2: {part2(lexer)}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 import re
 import sys
+from argparse import ArgumentParser
+from pathlib import Path
 from typing import Dict, List, Tuple
 
 
@@ -36,10 +38,15 @@ def validate(messages: List[str], pattern: str) -> List[str]:
     return [m for m in messages if validator.fullmatch(m)]
 
 
+def part1(notes: Tuple[Dict[str, List[str]], List[str]]) -> int:
+    rules, messages = notes
+    pattern = build_regex(rules)
+    return len(validate(messages, pattern))
+
+
 def main(filename: str) -> None:
     rules, messages = parse(filename)
-    pattern = build_regex(rules)
-    count = len(validate(messages, pattern))
+    count = part1((rules, messages))
     print(f'Step 1: {count}')
 
     rules['8'] = ['42', '*', '|']
@@ -48,4 +55,12 @@ def main(filename: str) -> None:
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
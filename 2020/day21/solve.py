@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 import re
 import sys
+from argparse import ArgumentParser
 from collections import Counter, namedtuple
 from itertools import chain
+from pathlib import Path
 from typing import Dict, List, Set, Tuple
 
 
@@ -45,19 +47,34 @@ def get_ingredients(foods: List[Food]) -> Tuple[Set[str], Dict[str, str]]:
     return safe, {i: a.pop() for i, a in contained.items()}
 
 
-def main(filename: str) -> None:
-    foods = parse(filename)
-    safe_ingredients, unsafe_ingredients = get_ingredients(foods)
-    safe_count = sum(Counter(
+def part1(foods: List[Food]) -> int:
+    safe_ingredients, _ = get_ingredients(foods)
+    return sum(Counter(
         ingredient
         for ingredient in chain(*(food.ingredients for food in foods))
         if ingredient in safe_ingredients
     ).values())
-    print(f'Step 1: {safe_count}')
 
+
+def part2(foods: List[Food]) -> str:
+    _, unsafe_ingredients = get_ingredients(foods)
     allergens = [a for i, a in sorted(unsafe_ingredients.items())]
-    print(f'Step 2: {",".join(allergens)}')
+    return ",".join(allergens)
+
+
+def main(filename: str) -> None:
+    foods = parse(filename)
+    print(f'Step 1: {part1(foods)}')
+    print(f'Step 2: {part2(foods)}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
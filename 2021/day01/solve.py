@@ -1,30 +1,66 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from collections import deque
+from pathlib import Path
+from typing import Iterable
 
+import numpy as np
 
-def parse(filename: str) -> list[int]:
-    depths = []
-    with open(filename) as f:
-        for line in f.readlines():
-            depths.append(int(line))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import ints, lines, read  # noqa: E402
 
-    return depths
 
+def parse(filename: str) -> np.ndarray:
+    return ints(read(filename))
 
-def main(filename: str) -> None:
-    depths = parse(filename)
 
-    n_increase = sum(n > p for n, p in zip(depths[1:], depths[:-1]))
-    print(f'Number of measurements larger than the previous one: {n_increase}')
+def part1(depths: np.ndarray) -> int:
+    return int(np.count_nonzero(depths[1:] > depths[:-1]))
+
+
+def part2(depths: np.ndarray) -> int:
+    # b + c + d > a + b + c only depends on d > a
+    return int(np.count_nonzero(depths[3:] > depths[:-3]))
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    """Both answers in one pass, only keeping the last three depths."""
+    previous: deque[int] = deque(maxlen=3)
+    increases = window_increases = 0
+    for line in lines:
+        if not line:
+            continue
+        depth = int(line)
+        if previous:
+            increases += depth > previous[-1]
+        if len(previous) == 3:
+            window_increases += depth > previous[0]
+        previous.append(depth)
+    return increases, window_increases
 
-    n_increase = sum(b + c + d > a + b + c
-                     for a, b, c, d in zip(depths[:-3],
-                                           depths[1:-2],
-                                           depths[2:-1],
-                                           depths[3:]))
+
+def main(filename: str, streaming: bool = False) -> None:
+    if streaming:
+        n_increase, n_window_increase = stream(lines(filename))
+    else:
+        depths = parse(filename)
+        n_increase = part1(depths)
+        n_window_increase = part2(depths)
+
+    print(f'Number of measurements larger than the previous one: {n_increase}')
     print(f'Number of sliding windows larger than '
-          f'the previous one: {n_increase}')
+          f'the previous one: {n_window_increase}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename', help='input file, - for stdin with --stream')
+    parser.add_argument('--stream', action='store_true',
+                        help='solve while reading the input line by line')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.stream)
@@ -1,9 +1,15 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
 from collections import namedtuple
+from pathlib import Path
+from typing import Iterable
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import lines  # noqa: E402
+
 
 Command = namedtuple('Command', ('direction', 'amount'))
 
@@ -42,19 +48,58 @@ def apply2(cmds: list[Command], pos: np.ndarray) -> np.ndarray:
     pass
 
 
-def main(filename: str) -> None:
-    cmds = parse(filename)
+def part1(cmds: list[Command]) -> int:
+    pos = apply1(cmds, np.zeros(2))
+    return int(pos[0] * pos[1])
+
+
+def part2(cmds: list[Command]) -> int:
+    pos = apply2(cmds, np.zeros(3))
+    return int(pos[0] * pos[1])
+
+
+def stream(lines: Iterable[str]) -> tuple[int, int]:
+    """Both answers in one pass, only keeping the position and aim.
+
+    The depth of the first part is what the second part calls the aim.
+    """
+    x = aim = depth = 0
+    for line in lines:
+        if not line:
+            continue
+        direction, amount = line.split()
+        if direction == 'forward':
+            x += int(amount)
+            depth += aim * int(amount)
+        elif direction == 'down':
+            aim += int(amount)
+        elif direction == 'up':
+            aim -= int(amount)
+        else:
+            raise ValueError(f'Unknown command {direction}')
+    return x * aim, x * depth
 
-    pos = np.zeros(2)
-    pos = apply1(cmds, pos)
 
-    print(f'Step 1: x * y = {int(pos[0] * pos[1])}')
+def main(filename: str, streaming: bool = False) -> None:
+    if streaming:
+        answer1, answer2 = stream(lines(filename))
+    else:
+        cmds = parse(filename)
+        answer1, answer2 = part1(cmds), part2(cmds)
 
-    pos = np.zeros(3)
-    pos = apply2(cmds, pos)
+    print(f'Step 1: x * y = {answer1}')
 
-    print(f'Step 2: x * y = {int(pos[0] * pos[1])}')
+    print(f'Step 2: x * y = {answer2}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename', help='input file, - for stdin with --stream')
+    parser.add_argument('--stream', action='store_true',
+                        help='solve while reading the input line by line')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.stream)
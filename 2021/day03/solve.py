@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
 from dataclasses import dataclass
 from math import inf
+from pathlib import Path
 from typing import Iterable, Optional
 
 import numpy as np
@@ -72,15 +74,31 @@ class Node:
             return ''
 
 
+def part1(report: np.ndarray) -> int:
+    gamma, epsilon = get_power(report)
+    return gamma * epsilon
+
+
+def part2(report: np.ndarray) -> int:
+    o2, co2 = get_life_support(report)
+    return o2 * co2
+
+
 def main(filename: str) -> None:
     report = parse(filename)
 
-    gamma, epsilon = get_power(report)
-    print(f'Step 1: power consumption = {gamma * epsilon}')
+    print(f'Step 1: power consumption = {part1(report)}')
 
-    o2, co2 = get_life_support(report)
-    print(f'Step 2: life support = {o2 * co2}')
+    print(f'Step 2: life support = {part2(report)}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
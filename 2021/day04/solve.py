@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from pathlib import Path
 from typing import Iterable
 
 import numpy as np
@@ -59,36 +61,52 @@ def parse(filename: str) -> tuple[list[int], list[Board]]:
     return draws, boards
 
 
-def main(filename: str) -> None:
-    draws, boards = parse(filename)
+def part1(bingo: tuple[list[int], list[Board]]) -> int:
+    draws, boards = bingo
+    for board in boards:
+        board.reset()
 
-    score = 0
     for draw in draws:
         for board in boards:
             board.mark(draw)
             if board.won:
-                score = board.score(draw)
-                break
-        else:
-            continue
-        break
-    print(f'Step 1: {score}')
+                return board.score(draw)
+    return 0
+
 
+def part2(bingo: tuple[list[int], list[Board]]) -> int:
+    draws, boards = bingo
     for board in boards:
         board.reset()
 
-    score = 0
     for draw in draws:
         for board in boards:
             board.mark(draw)
         remaining_boards = [board for board in boards if not board.won]
         if not remaining_boards:
             assert len(boards) == 1
-            score = boards[0].score(draw)
-            break
+            return boards[0].score(draw)
         boards = remaining_boards
+    return 0
+
+
+def main(filename: str) -> None:
+    bingo = parse(filename)
+
+    score = part1(bingo)
+    print(f'Step 1: {score}')
+
+    score = part2(bingo)
     print(f'Step 2: {score}')
 
 
 if __name__ == '__main__':
-    main(sys.argv[1])
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename)
@@ -1,12 +1,13 @@
 #!/usr/bin/env python
 import re
+import sys
 from argparse import ArgumentParser
 from collections import Counter, namedtuple
 from os.path import splitext
+from pathlib import Path
 from typing import Iterable, Optional, TypeVar
 
 import numpy as np
-from PIL import Image
 
 
 Point = namedtuple('Point', ('x', 'y'))
@@ -63,6 +64,9 @@ class Map:
         return points
 
     def save_png(self, filename: str) -> None:
+        # Only needed with --output, don't pay for the import otherwise
+        from PIL import Image
+
         data = np.zeros((self.height, self.width, 3), dtype=np.uint8)
         max_count = self.vents.most_common(1)[0][1]
         for point, count in self.vents.items():
@@ -89,37 +93,47 @@ def parse(filename: str) -> list[Line]:
     return vent_lines
 
 
-def main(filename: str, verbose: int, output: Optional[str] = None) -> None:
-    vent_lines = parse(filename)
-
+def draw(vent_lines: list[Line],
+         ignore_diags: bool = False,
+         verbose: int = 0) -> Map:
     map = Map()
     for vent_line in vent_lines:
-        map.add_vents(vent_line, ignore_diags=True)
+        map.add_vents(vent_line, ignore_diags=ignore_diags)
         if verbose > 1:
             input(f'{map}\n')
     if verbose == 1:
         print(f'\n{map}\n')
-    print(f'Step 1: {len(map.overlaps(2))}')
-    if output:
-        map.save_png(f'{output}_nodiags.png')
+    return map
+
+
+def part1(vent_lines: list[Line], verbose: int = 0) -> int:
+    return len(draw(vent_lines, ignore_diags=True, verbose=verbose).overlaps(2))
+
+
+def part2(vent_lines: list[Line], verbose: int = 0) -> int:
+    return len(draw(vent_lines, verbose=verbose).overlaps(2))
+
+
+def main(filename: str, verbose: int, output: Optional[str] = None) -> None:
+    vent_lines = parse(filename)
+
+    print(f'Step 1: {part1(vent_lines, verbose)}')
+    print(f'Step 2: {part2(vent_lines, verbose)}')
 
-    map = Map()
-    for vent_line in vent_lines:
-        map.add_vents(vent_line)
-        if verbose > 1:
-            input(f'{map}\n')
-    if verbose == 1:
-        print(f'\n{map}\n')
-    print(f'Step 2: {len(map.overlaps(2))}')
     if output:
-        map.save_png(f'{output}.png')
+        draw(vent_lines, ignore_diags=True).save_png(f'{output}_nodiags.png')
+        draw(vent_lines).save_png(f'{output}.png')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
     parser.add_argument('--output', '-o')
+    add_arguments(parser)
     args = parser.parse_args()
     if args.output:
         outfile, ext = splitext(args.output)
@@ -128,6 +142,7 @@ if __name__ == '__main__':
     else:
         outfile = None
     try:
-        main(args.filename, args.verbose, outfile)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose, outfile)
     except KeyboardInterrupt:
         pass
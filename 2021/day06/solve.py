@@ -1,6 +1,8 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from collections import Counter
+from pathlib import Path
 from typing import Iterator
 
 
@@ -32,9 +34,7 @@ class School:
         return self._fishes.elements()
 
 
-def main(filename: str, days: int, verbose: int) -> None:
-    fishes = parse(filename)
-
+def simulate(fishes: Counter, days: int, verbose: int = 0) -> int:
     school = School(fishes)
     if verbose:
         print(f'Initial state: '
@@ -44,16 +44,37 @@ def main(filename: str, days: int, verbose: int) -> None:
         if verbose:
             print(f'After {day + 1:2d} days: '
                   f'{",".join(str(fish) for fish in school.fishes)}')
-    print(f'laternfish after {days} days: {school.size}')
+    return school.size
+
+
+def part1(fishes: Counter) -> int:
+    return simulate(fishes, 80)
+
+
+def part2(fishes: Counter) -> int:
+    return simulate(fishes, 256)
+
+
+def main(filename: str, days: int, verbose: int) -> None:
+    fishes = parse(filename)
+
+    size = simulate(fishes, days, verbose)
+    print(f'laternfish after {days} days: {size}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import PHASES, add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
     parser.add_argument('--days', '-d', default=80, type=int)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.days, args.verbose)
+        # Any number of days can be asked for, not only the parts' ones
+        with instrumented(globals(), args, (*PHASES, 'simulate')):
+            main(args.filename, args.days, args.verbose)
     except KeyboardInterrupt:
         pass
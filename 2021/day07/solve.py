@@ -1,6 +1,8 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from math import inf
+from pathlib import Path
 from statistics import median
 from typing import Callable
 
@@ -23,25 +25,39 @@ def total_fuel(xs: list[int], target: int, cost: Callable) -> int:
     return sum(cost(x, target) for x in xs)
 
 
-def main(filename: str, verbose: int) -> None:
-    xs = parse(filename)
-
+def part1(xs: list[int]) -> int:
     median_x = int(median(xs))
-    fuel = total_fuel(xs, median_x, cost1)
-    print(f'Step 1: fuel to spend: {fuel}')
+    return total_fuel(xs, median_x, cost1)
 
+
+def part2(xs: list[int]) -> int:
     fuel = inf
     for x in range(min(xs), max(xs)):
         fuel = min(fuel, total_fuel(xs, x, cost2))
+    return fuel
+
+
+def main(filename: str, verbose: int) -> None:
+    xs = parse(filename)
+
+    fuel = part1(xs)
+    print(f'Step 1: fuel to spend: {fuel}')
+
+    fuel = part2(xs)
     print(f'Step 2: fuel to spend: {fuel}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
+from pathlib import Path
 
 
 LOOKUP = {
@@ -34,14 +36,13 @@ def parse(filename: str) -> list[dict[str, list[set[str]]]]:
             for display in (l.strip().split(' | ') for l in f)]
 
 
-def main(filename: str, verbose: int) -> None:
-    notes = parse(filename)
+def part1(notes: list[dict[str, list[set[str]]]]) -> int:
+    return sum(len(out) in {2, 3, 4, 7}
+               for note in notes
+               for out in note['outputs'])
 
-    total = sum(len(out) in {2, 3, 4, 7}
-                for note in notes
-                for out in note['outputs'])
-    print(f'Step 1: {total}')
 
+def part2(notes: list[dict[str, list[set[str]]]], verbose: int = 0) -> int:
     total = 0
     for note in notes:
         for pattern in note['inputs']:
@@ -55,15 +56,30 @@ def main(filename: str, verbose: int) -> None:
             outputs = " ".join("".join(sorted(out)) for out in note["outputs"])
             print(f'{outputs}: {value}')
         total += value
+    return total
+
+
+def main(filename: str, verbose: int) -> None:
+    notes = parse(filename)
+
+    total = part1(notes)
+    print(f'Step 1: {total}')
+
+    total = part2(notes, verbose)
     print(f'Step 2: {total}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,84 +1,91 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from functools import cached_property
 from math import prod
-from typing import Iterator, NamedTuple
+from pathlib import Path
 
+import numpy as np
 
-class Point(NamedTuple):
-    x: int
-    y: int
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.grid import NEIGHBORS4, Grid  # noqa: E402
 
-    def __repr__(self):
-        return str((self.x, self.y))
 
+WALL = 9
+
+
+def parse(filename: str) -> Grid:
+    return Grid.from_digits(filename)
 
-def parse(filename: str) -> dict[Point, int]:
-    with open(filename) as f:
-        return {
-            Point(x, y): int(v)
-            for y, line in enumerate(f)
-            for x, v in enumerate(line.strip())
-        }
 
 class HeightMap:
-    def __init__(self, heights: dict[Point, int]):
+    def __init__(self, heights: Grid):
         self.heights = heights
 
     @cached_property
-    def low_points(self) -> list[Point]:
-        low_points = []
-        for p, h in self.heights.items():
-            if h < min(*(self.heights[n] for n in self.neighbors(p))):
-                low_points.append(p)
-        return low_points
-
-    def neighbors(self, p: Point) -> Iterator[Point]:
-        return (
-            n for n in [
-                Point(p.x - 1, p.y),
-                Point(p.x + 1, p.y),
-                Point(p.x, p.y - 1),
-                Point(p.x, p.y + 1),
-            ]
-            if n in self.heights)
+    def low_points(self) -> np.ndarray:
+        heights = self.heights.cells
+        # Past the edges is higher than any height
+        low = np.ones(heights.shape, bool)
+        for neighbor in self.heights.neighbors(NEIGHBORS4, fill=WALL + 1):
+            low &= heights < neighbor
+        return low
 
     @cached_property
     def risk_level(self) -> int:
-        risk_level = 0
-        for point in self.low_points:
-            risk_level += 1 + self.heights[point]
-        return risk_level
+        return int((self.heights.cells[self.low_points] + 1).sum())
 
     @cached_property
-    def basins(self) -> list[set[Point]]:
-        basins = []
-        for low_point in self.low_points:
-            basin = set()
-            todo = {low_point}
-            while todo:
-                p = todo.pop()
-                if self.heights[p] < 9:
-                    basin.add(p)
-                    todo.update(set(self.neighbors(p)) - basin)
-            basins.append(basin)
-        return sorted(basins, key=len)
+    def basins(self) -> list[int]:
+        """Sizes of the basin of each low point, from smallest to largest."""
+        # Union-find over flat indexes: every round hooks the root of one
+        # end of each edge still joining two trees onto the smaller root,
+        # then jumps pointers until every cell points to its root. Each
+        # tree merges with another at least, so few rounds are needed.
+        open_ = self.heights.cells < WALL
+        index = np.arange(self.heights.size).reshape(self.heights.shape)
+        right = index[:, :-1][open_[:, :-1] & open_[:, 1:]]
+        down = index[:-1][open_[:-1] & open_[1:]]
+        ends = (np.concatenate([right, down]),
+                np.concatenate([right + 1, down + self.heights.width]))
+        parent = np.arange(self.heights.size)
+        while ends[0].size:
+            roots = parent[ends[0]], parent[ends[1]]
+            apart = roots[0] != roots[1]
+            ends = ends[0][apart], ends[1][apart]
+            low, high = np.minimum(*roots)[apart], np.maximum(*roots)[apart]
+            parent[high] = low
+            while not np.array_equal(jumped := parent[parent], parent):
+                parent = jumped
+        sizes = np.bincount(parent)
+        return sorted(sizes[parent[self.low_points.ravel()]].tolist())
+
+
+def part1(heights: Grid) -> int:
+    return HeightMap(heights).risk_level
+
+
+def part2(heights: Grid) -> int:
+    return prod(HeightMap(heights).basins[-3:])
 
 
 def main(filename: str, verbose: int) -> None:
     heights = parse(filename)
-    heightmap = HeightMap(heights)
 
-    print(f'Step 1: {heightmap.risk_level}')
-    print(f'Step 2: {prod(map(len, heightmap.basins[-3:]))}')
+    print(f'Step 1: {part1(heights)}')
+    print(f'Step 2: {part2(heights)}')
 
 
 if __name__ == '__main__':
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,6 +1,12 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from functools import reduce
+from pathlib import Path
+from typing import Iterable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import lines as read_lines  # noqa: E402
 
 
 SCORE_TABLE = {
@@ -33,10 +39,14 @@ class SyntaxChecker:
             self.lines = f.read().splitlines()
 
     def autocomplete(self, line: int) -> str:
+        return self.complete(self.lines[line], line, self.filename)
+
+    @classmethod
+    def complete(cls, text: str, line: int, filename: str) -> str:
         waiting = []
-        for offset, c in enumerate(self.lines[line]):
-            if c in self.pairs:
-                waiting.append(self.pairs[c])
+        for offset, c in enumerate(text):
+            if c in cls.pairs:
+                waiting.append(cls.pairs[c])
             else:
                 try:
                     expected = waiting.pop()
@@ -44,33 +54,41 @@ class SyntaxChecker:
                     raise SyntaxError(
                         f'Unexpected character {c}!',
                         (
-                            self.filename,
+                            filename,
                             line,
                             offset + 1,
-                            self.lines[line],
+                            text,
                         ),
                     )
                 if c != expected:
                     raise SyntaxError(
                         f'Expected {expected}, but found {c} instead!',
                         (
-                            self.filename,
+                            filename,
                             line,
                             offset + 1,
-                            self.lines[line],
+                            text,
                         ),
                     )
         return ''.join(reversed(waiting))
 
 
-def main(filename: str, verbose: int) -> None:
-    checker = SyntaxChecker(filename)
+def parse(filename: str) -> SyntaxChecker:
+    return SyntaxChecker(filename)
+
+
+def check(checker: SyntaxChecker, verbose: int = 0) -> tuple[int, list[int]]:
+    return check_lines(checker.lines, checker.filename, verbose)
 
+
+def check_lines(lines: Iterable[str],
+                filename: str,
+                verbose: int = 0) -> tuple[int, list[int]]:
     error_score = 0
     scores = []
-    for line in range(len(checker.lines)):
+    for line, text in enumerate(lines):
         try:
-            completion = checker.autocomplete(line)
+            completion = SyntaxChecker.complete(text, line, filename)
         except SyntaxError as e:
             error_score += SCORE_TABLE['error'][e.text[e.offset - 1]]
             if verbose >= 2:
@@ -89,18 +107,55 @@ def main(filename: str, verbose: int) -> None:
                 print(f'Completion line {line + 1}: {completion}')
                 if verbose >= 2:
                     print()
-    score = sorted(scores)[len(scores) // 2]
+    return error_score, scores
+
+
+def part1(checker: SyntaxChecker) -> int:
+    return check(checker)[0]
+
+
+def part2(checker: SyntaxChecker) -> int:
+    scores = check(checker)[1]
+    return sorted(scores)[len(scores) // 2]
+
+
+def stream(lines: Iterable[str],
+           filename: str = '<stdin>',
+           verbose: int = 0) -> tuple[int, int]:
+    """Both answers in one pass over the lines.
+
+    Only the autocomplete score of the incomplete lines is kept, as the
+    middle one can't be known before the end.
+    """
+    error_score, scores = check_lines(lines, filename, verbose)
+    return error_score, sorted(scores)[len(scores) // 2]
+
+
+def main(filename: str, verbose: int, streaming: bool = False) -> None:
+    if streaming:
+        error_score, score = stream(read_lines(filename), filename, verbose)
+    else:
+        checker = parse(filename)
+        if verbose:
+            check(checker, verbose)
+        error_score, score = part1(checker), part2(checker)
 
     print(f'\nStep 1: syntax error score: {error_score}')
     print(f'Step 2: autocomplete score: {score}')
 
 
 if __name__ == '__main__':
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
-    parser.add_argument('filename')
+    parser.add_argument('filename', help='input file, - for stdin with --stream')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    parser.add_argument('--stream', action='store_true',
+                        help='solve while reading the input line by line')
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose, args.stream)
     except KeyboardInterrupt:
         pass
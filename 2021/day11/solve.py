@@ -1,72 +1,44 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
-from typing import NamedTuple
+from pathlib import Path
 
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.grid import NEIGHBORS8, Grid, neighbor_sum  # noqa: E402
 
-class Point(NamedTuple):
-    x: int
-    y: int
 
-
-def parse(filename: str) -> list[list[int]]:
-    with open(filename, 'r') as f:
-        return [[int(o) for o in line.strip()] for line in f]
+def parse(filename: str) -> Grid:
+    return Grid.from_digits(filename)
 
 
 class OctopusGrid:
-    def __init__(self, octopuses: list[list[int]]) -> None:
-        self._octopuses = np.array(octopuses).T
+    def __init__(self, octopuses: Grid) -> None:
+        self._octopuses = octopuses.copy()
 
     def __str__(self) -> str:
-        return '\n'.join(''.join(str(o) for o in r) for r in self._octopuses.T)
+        return str(self._octopuses)
 
     @property
     def size(self) -> int:
         return self._octopuses.size
 
     def step(self) -> int:
-        blinks = 0
-        self._octopuses += 1
-        triggered = set()
-        todo = {
-            Point(x, y)
-            for x in range(self._octopuses.shape[0])
-            for y in range(self._octopuses.shape[1])
-        }
-        while todo:
-            p = todo.pop()
-            if self._octopuses[p] > 9:
-                blinks += 1
-                triggered.add(p)
-                self._octopuses[p] = 0
-                for n in self.neighbors(p) - triggered:
-                    self._octopuses[n] += 1
-                    todo.add(n)
-
-        return blinks
-
-    def neighbors(self, p: Point) -> set[Point]:
-        return {
-            n
-            for n in [
-                Point(p.x - 1, p.y - 1),
-                Point(p.x, p.y - 1),
-                Point(p.x + 1, p.y - 1),
-                Point(p.x - 1, p.y),
-                Point(p.x + 1, p.y),
-                Point(p.x - 1, p.y + 1),
-                Point(p.x, p.y + 1),
-                Point(p.x + 1, p.y + 1),
-            ]
-            if (0 <= n.x < self._octopuses.shape[0]
-                and 0 <= n.y < self._octopuses.shape[1])
-        }
-
-
-def main(filename: str, steps: int, verbose: int) -> None:
-    octopuses = parse(filename)
+        energy = self._octopuses.cells
+        energy += 1
+        flashed = np.zeros(energy.shape, bool)
+        while True:
+            flashing = (energy > 9) & ~flashed
+            if not flashing.any():
+                break
+            flashed |= flashing
+            energy += neighbor_sum(flashing, NEIGHBORS8)
+        energy[flashed] = 0
+        return int(np.count_nonzero(flashed))
+
+
+def part1(octopuses: Grid, steps: int = 100, verbose: int = 0) -> int:
     grid = OctopusGrid(octopuses)
     blinks = 0
     if verbose:
@@ -79,23 +51,38 @@ def main(filename: str, steps: int, verbose: int) -> None:
             print(f'After step {i}')
             print(grid)
             print()
+    return blinks
 
-    print(f'\nStep 1: total flashes: {blinks}')
 
-    while True:
+def part2(octopuses: Grid) -> int:
+    grid = OctopusGrid(octopuses)
+    i = 1
+    while grid.step() != grid.size:
         i += 1
-        if grid.step() == grid.size:
-            break
+    return i
+
+
+def main(filename: str, steps: int, verbose: int) -> None:
+    octopuses = parse(filename)
+
+    blinks = part1(octopuses, steps, verbose)
+    print(f'\nStep 1: total flashes: {blinks}')
+
+    i = part2(octopuses)
     print(f'Step 2: first synced flash at step {i}')
 
 
 if __name__ == '__main__':
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
-    parser.add_argument('--steps', '-s', default=100)
+    parser.add_argument('--steps', '-s', type=int, default=100)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.steps, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.steps, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from collections import defaultdict
+from pathlib import Path
 
 
 def parse(filename: str) -> dict[str, set[str]]:
@@ -46,30 +48,42 @@ def walk(
     return paths
 
 
-def main(filename: str, verbose: int) -> None:
-    graph = parse(filename)
-
+def part1(graph: dict[str, set[str]], verbose: int = 0) -> int:
     paths = walk(graph, 'start', 'end')
     if verbose:
         for path in paths:
             print(','.join(path))
-    print(f'\nStep 1: {len(paths)} paths through cave system')
+    return len(paths)
 
+
+def part2(graph: dict[str, set[str]], verbose: int = 0) -> int:
     paths = walk(graph, 'start', 'end', extra_visit=True)
     if verbose:
         print()
-        from collections import Counter
         for path in paths:
             print(','.join(path))
-    print(f'\nStep 2: {len(paths)} paths through cave system')
+    return len(paths)
+
+
+def main(filename: str, verbose: int) -> None:
+    graph = parse(filename)
+
+    print(f'\nStep 1: {part1(graph, verbose)} paths through cave system')
+
+    print(f'\nStep 2: {part2(graph, verbose)} paths through cave system')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 import re
+import sys
 from argparse import ArgumentParser
 from enum import auto, Enum
+from pathlib import Path
 from typing import NamedTuple
 
 import numpy as np
@@ -71,8 +73,21 @@ class Paper:
         self.dots = new_dots
 
 
-def main(filename: str, verbose: int) -> None:
-    size, dots, folds = parse(filename)
+def part1(manual: tuple[tuple[int, int], list[Dot], list[Fold]]) -> int:
+    size, dots, folds = manual
+
+    paper = Paper(size)
+    for dot in dots:
+        paper.mark(dot)
+    paper.fold(folds[0])
+    return len(paper.dots)
+
+
+def part2(
+    manual: tuple[tuple[int, int], list[Dot], list[Fold]],
+    verbose: int = 0,
+) -> str:
+    size, dots, folds = manual
 
     paper = Paper(size)
     for i, dot in enumerate(dots):
@@ -91,21 +106,32 @@ def main(filename: str, verbose: int) -> None:
             print(f'Paper after fold {i}')
             print(paper)
             print()
-        if i == 1:
-            dots_first_fold = len(paper.dots)
+    return str(paper)
+
+
+def main(filename: str, verbose: int) -> None:
+    manual = parse(filename)
+
+    code = part2(manual, verbose)
+    dots_first_fold = part1(manual)
 
     print('Final paper:')
-    print(paper)
+    print(code)
     print(f'\nStep 1: number of dots after first fold: {dots_first_fold}')
     print('Step 2: Read code final paper above')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from collections import Counter
 from itertools import chain
+from pathlib import Path
 from typing import Iterator
 
 
@@ -59,24 +61,39 @@ def fast_polymerize(template: str,
     return elements
 
 
-def main(filename: str, verbose: int) -> None:
-    template, rules = parse(filename)
-
+def part1(manual: tuple[str, dict[str, str]], verbose: int = 0) -> int:
+    template, rules = manual
     polymer = polymerize(template, rules, 10, verbose)
     most_common, *_, least_common = Counter(polymer).most_common()
-    print(f'\nStep 1: {most_common[1] - least_common[1]}')
+    return most_common[1] - least_common[1]
+
 
+def part2(manual: tuple[str, dict[str, str]], verbose: int = 0) -> int:
+    template, rules = manual
     elements = fast_polymerize(template, rules, 40, verbose)
     most_common, *_, least_common = elements.most_common()
-    print(f'\nStep 2: {most_common[1] - least_common[1]}')
+    return most_common[1] - least_common[1]
+
+
+def main(filename: str, verbose: int) -> None:
+    manual = parse(filename)
+
+    print(f'\nStep 1: {part1(manual, verbose)}')
+
+    print(f'\nStep 2: {part2(manual, verbose)}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,109 +1,102 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from heapq import heappop, heappush
-from typing import NamedTuple
+from pathlib import Path
 
 import numpy as np
 
-
-class Point(NamedTuple):
-    x: int
-    y: int
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.grid import NEIGHBORS4, Grid  # noqa: E402
 
 
 class PriorityQueue:
     def __init__(self) -> None:
-        self.elements: list[tuple[float, Point]] = []
+        self.elements: list[tuple[int, int]] = []
 
-    def push(self, item: Point, priority: float) -> None:
+    def push(self, item: int, priority: int) -> None:
         heappush(self.elements, (priority, item))
 
-    def pop(self) -> Point:
+    def pop(self) -> int:
         return heappop(self.elements)[1]
 
     def __len__(self) -> int:
         return len(self.elements)
 
 
-def manhattan(a: Point, b: Point) -> int:
-    return abs(a.x - b.x) + abs(a.y - b.y)
-
-
-def neighbors(p: Point, rmap: np.ndarray):
-    return [
-        n for n in [
-            Point(p.x - 1, p.y),
-            Point(p.x + 1, p.y),
-            Point(p.x, p.y - 1),
-            Point(p.x, p.y + 1),
-        ]
-        if 0 <= n.x < rmap.shape[0] and 0 <= n.y < rmap.shape[1]
-    ]
-
-
-def astar(rmap: np.ndarray, start: Point, end: Point) -> int:
-    costs = np.ones(rmap.shape) * np.inf
+def astar(rmap: Grid) -> int:
+    """Lowest total risk from the top left to the bottom right corner."""
+    # Cells are flat indexes in the map padded with walls, so that the
+    # neighbors of any cell can be visited without bounds checks
+    wall = -1
+    risks = rmap.padded(fill=0).astype(int)
+    risks[[0, -1], :] = risks[:, [0, -1]] = wall
+    risks = risks.ravel().tolist()
+    offsets = rmap.flat_offsets(NEIGHBORS4)
+    stride = rmap.width + 2
+    start = rmap.flat_index(0, 0)
+    end = rmap.flat_index(rmap.height - 1, rmap.width - 1)
+    end_y, end_x = divmod(end, stride)
+
+    costs = [sys.maxsize] * len(risks)
     frontier = PriorityQueue()
     frontier.push(start, 0)
     costs[start] = 0
-
     while frontier:
         p = frontier.pop()
-
         if p == end:
             break
-
-        for n in neighbors(p, rmap):
-            cost = costs[p] + rmap[n]
+        for n in (p + offset for offset in offsets):
+            if risks[n] == wall:
+                continue
+            cost = costs[p] + risks[n]
             if cost < costs[n]:
                 costs[n] = cost
-                frontier.push(n, cost + manhattan(n, end))
+                y, x = divmod(n, stride)
+                frontier.push(n, cost + (end_y - y) + (end_x - x))
+    return costs[end]
+
 
-    return int(costs[end])
+def upscale(rmap: Grid, factor: int) -> Grid:
+    h, w = rmap.shape
+    tiles = np.arange(factor)
+    increments = tiles.repeat(h)[:, None] + tiles.repeat(w)[None, :]
+    out = np.tile(rmap.cells, (factor, factor)) + increments.astype(np.uint8)
+    return Grid((out - 1) % 9 + 1, rmap.offset)
 
 
-def upscale(rmap: np.ndarray, factor: int) -> np.ndarray:
-    w, h = rmap.shape
-    out = np.zeros((w * factor, h * factor))
-    for x in range(factor):
-        for y in range(factor):
-            out[x*w:(x+1)*w, y*h:(y+1)*h] = (rmap + x + y - 1) % 9 + 1
-    return out
-    return out
+def parse(filename: str) -> Grid:
+    return Grid.from_digits(filename)
 
 
-def parse(filename: str) -> np.ndarray:
-    with open(filename, 'r') as f:
-        risks = np.array([[int(risk) for risk in line.strip()] for line in f])
+def part1(risk_map: Grid) -> int:
+    return astar(risk_map)
 
-    return risks.T
+
+def part2(risk_map: Grid) -> int:
+    return astar(upscale(risk_map, 5))
 
 
 def main(filename: str, verbose: int) -> None:
     risk_map = parse(filename)
 
-    path_risk = astar(
-        risk_map,
-        start=Point(0, 0),
-        end=Point(risk_map.shape[0] - 1, risk_map.shape[1] - 1),
-    )
+    path_risk = part1(risk_map)
     print(f'\nStep 1: lowest total risk: {path_risk}')
 
-    risk_map = upscale(risk_map, 5)
-    path_risk = astar(
-        risk_map,
-        start=Point(0, 0),
-        end=Point(risk_map.shape[0] - 1, risk_map.shape[1] - 1),
-    )
+    path_risk = part2(risk_map)
     print(f'\nStep 2: lowest total risk: {path_risk}')
 
 
 if __name__ == '__main__':
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
 from dataclasses import dataclass
 from math import prod
@@ -178,6 +179,14 @@ class EqPacket(OperatorPacket):
         return f'({self.packets[0]} = {self.packets[1]})'
 
 
+def part1(bits: str) -> int:
+    return Packet.frombits(bits).cumulated_version
+
+
+def part2(bits: str) -> int:
+    return Packet.frombits(bits).value
+
+
 def main(filename: str, verbose: int) -> None:
     if Path(filename).exists():
         bits = parse(filename)
@@ -185,19 +194,23 @@ def main(filename: str, verbose: int) -> None:
         bits = ''.join(format(b, '08b')
                        for b in bytes.fromhex(filename))
 
-    packet = Packet.frombits(bits)
     if verbose:
-        print(packet)
-    print(f'\nStep 1: sum of versions: {packet.cumulated_version}')
-    print(f'\nStep 2: value of transmission: {packet.value}')
+        print(Packet.frombits(bits))
+    print(f'\nStep 1: sum of versions: {part1(bits)}')
+    print(f'\nStep 2: value of transmission: {part2(bits)}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
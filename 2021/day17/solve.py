@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 import re
+import sys
 from argparse import ArgumentParser
 from itertools import product
 from math import floor, sqrt
+from pathlib import Path
 from typing import NamedTuple
 
 
@@ -88,24 +90,37 @@ def hit(v: Velocity, t: Target) -> bool:
             v += Velocity(-1, 0)
 
 
-def main(filename: str, verbose: int) -> None:
-    target = parse(filename)
+def part1(target: Target) -> int:
+    return throw_highest_point(target)
 
-    peak = throw_highest_point(target)
-    print(f'\nStep 1: peak: {peak}\n')
 
+def part2(target: Target, verbose: int = 0) -> int:
     shots = calculate_shots(target)
     if verbose:
         print(' '.join(f'{s.x},{s.y}' for s in shots))
-    print(f'Step 2: possible shots: {len(shots)}')
+    return len(shots)
+
+
+def main(filename: str, verbose: int) -> None:
+    target = parse(filename)
+
+    peak = part1(target)
+    print(f'\nStep 1: peak: {peak}\n')
+
+    print(f'Step 2: possible shots: {part2(target, verbose)}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
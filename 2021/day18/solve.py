@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 import json
+import sys
 from argparse import ArgumentParser
 from copy import deepcopy
 from dataclasses import dataclass
 from itertools import permutations
 from math import ceil, floor
+from pathlib import Path
 from typing import Optional, Union
 
 
@@ -116,9 +118,7 @@ def parse(filename: str) -> list[SnailfishNumber]:
         return [SnailfishNumber.from_string(line.strip()) for line in f]
 
 
-def main(filename: str, verbose: int) -> None:
-    snailfish_numbers = parse(filename)
-
+def part1(snailfish_numbers: list[SnailfishNumber], verbose: int = 0) -> int:
     total = snailfish_numbers[0]
     for sn in snailfish_numbers[1:]:
         if verbose:
@@ -127,20 +127,37 @@ def main(filename: str, verbose: int) -> None:
         total += sn
         if verbose:
             print(f'=  {total}\n')
-    print(f'Step 1: final sum magnitude: {total.magnitude}')
+    return total.magnitude
 
+
+def part2(snailfish_numbers: list[SnailfishNumber]) -> int:
     max_magnitude = 0
     for a, b in permutations(snailfish_numbers, 2):
         max_magnitude = max(max_magnitude, (a + b).magnitude)
-    print(f'Step 2: largest magnitude of any sum of two: {max_magnitude}')
+    return max_magnitude
+
+
+def main(filename: str, verbose: int) -> None:
+    snailfish_numbers = parse(filename)
+
+    print(f'Step 1: final sum magnitude: '
+          f'{part1(snailfish_numbers, verbose)}')
+
+    print(f'Step 2: largest magnitude of any sum of two: '
+          f'{part2(snailfish_numbers)}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,6 +1,9 @@
 #!/usr/bin/env python
+import sys
 from argparse import ArgumentParser
+from copy import deepcopy
 from math import inf
+from pathlib import Path
 from typing import NewType
 
 import numpy as np
@@ -69,29 +72,53 @@ def parse(filename: str) -> tuple[Algorithm, Image]:
     return algo, img
 
 
-def main(filename: str, verbose: int) -> None:
-    algo, img = parse(filename)
+def enhance(
+    scan: tuple[Algorithm, Image],
+    times: int,
+    verbose: int = 0,
+) -> float:
+    algo, img = scan
+    img = deepcopy(img)
 
-    if verbose:
-        print(f'Initial image:\n{img}')
-    for i in range(50):
+    for i in range(times):
         img.enhance(algo)
         if verbose > 1:
             print(f'\nAfter {i + 1} enhances:\n{img}')
-        if i == 1:
-            step1_res = img.count_lit_pixels()
     if verbose:
         print(f'\nFinal image:\n{img}')
+    return img.count_lit_pixels()
+
+
+def part1(scan: tuple[Algorithm, Image]) -> float:
+    return enhance(scan, 2)
+
+
+def part2(scan: tuple[Algorithm, Image], verbose: int = 0) -> float:
+    return enhance(scan, 50, verbose)
+
+
+def main(filename: str, verbose: int) -> None:
+    scan = parse(filename)
+
+    if verbose:
+        print(f'Initial image:\n{scan[1]}')
+    step2_res = part2(scan, verbose)
+    step1_res = part1(scan)
     print(f'\nStep 1: lit pixels after 2 enhances: {step1_res}')
-    print(f'Step 2: lit pixels after 50 enhances: {img.count_lit_pixels()}')
+    print(f'Step 2: lit pixels after 50 enhances: {step2_res}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
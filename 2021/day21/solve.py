@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 import re
+import sys
 from argparse import ArgumentParser
 from collections import Counter
 from collections.abc import Iterator, Sequence
 from itertools import cycle, islice, product, repeat
 from operator import attrgetter
+from pathlib import Path
 from typing import NamedTuple
 
 
@@ -143,16 +145,15 @@ class QuantumDiracDice:
         self.player = not self.player
 
 
-def main(filename: str, verbose: int) -> None:
-    starting_positions = parse(filename)
-
+def part1(starting_positions: list[int], verbose: int = 0) -> int:
     dice = cycle(range(1, 101))
     game = DiracDice(starting_positions, dice, verbose)
     while not game.won:
         game.turn()
-    result = game.dice_rolls * min(*game.scores)
-    print(f'\nStep 1: {result}')
+    return game.dice_rolls * min(*game.scores)
 
+
+def part2(starting_positions: list[int], verbose: int = 0) -> int:
     qdice = repeat((1, 2, 3))
     qgame = QuantumDiracDice(starting_positions, qdice, 21)
     i = 0
@@ -165,16 +166,29 @@ def main(filename: str, verbose: int) -> None:
             print(f'    player 1 won in {qgame.universes_won[0]} universes')
             print(f'    player 2 won in {qgame.universes_won[1]} universes')
         qgame.turn()
+    return max(*qgame.universes_won)
+
 
-    print(f'\nStep 2: best player won in {max(*qgame.universes_won)} universes')
+def main(filename: str, verbose: int) -> None:
+    starting_positions = parse(filename)
+
+    print(f'\nStep 1: {part1(starting_positions, verbose)}')
+
+    print(f'\nStep 2: best player won in '
+          f'{part2(starting_positions, verbose)} universes')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 import re
+import sys
 from argparse import ArgumentParser
 from collections import OrderedDict
-from typing import NamedTuple, Optional
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
 
 
 class Cuboid(NamedTuple):
@@ -130,6 +132,9 @@ class Core:
         return new_core
 
 
+REGION = Cuboid((-50, 50), (-50, 50), (-50, 50))
+
+
 def parse(filename: str) -> OrderedDict[Cuboid, bool]:
     with open(filename, 'r') as f:
         return OrderedDict(
@@ -152,23 +157,42 @@ def parse(filename: str) -> OrderedDict[Cuboid, bool]:
         )
 
 
+def reboot(steps: Iterable[tuple[Cuboid, bool]]) -> Core:
+    core = Core()
+    for cuboid, state in steps:
+        core.turn(cuboid, state)
+    return core
+
+
+def part1(procedure: OrderedDict[Cuboid, bool]) -> int:
+    # Only the parts of the steps inside the region can turn cubes there
+    return reboot((clipped, state)
+                  for cuboid, state in procedure.items()
+                  if (clipped := cuboid & REGION)).cubes_on
+
+
+def part2(procedure: OrderedDict[Cuboid, bool]) -> int:
+    return reboot(procedure.items()).cubes_on
+
+
 def main(filename: str, verbose: int) -> None:
     procedure = parse(filename)
 
-    core = Core()
-    for cuboid, state in procedure.items():
-        core.turn(cuboid, state)
-    print(f'Step 1: cubes ON in region: '
-          f'{(core & Cuboid((-50, 50), (-50, 50), (-50, 50))).cubes_on}')
-    print(f'Step 2: total cubes ON: {core.cubes_on}')
+    print(f'Step 1: cubes ON in region: {part1(procedure)}')
+    print(f'Step 2: total cubes ON: {part2(procedure)}')
 
 
 if __name__ == '__main__':
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+    from aoc.instrument import add_arguments, instrumented
+
     parser = ArgumentParser()
     parser.add_argument('filename')
     parser.add_argument('--verbose', '-v', action='count', default=0)
+    add_arguments(parser)
     args = parser.parse_args()
     try:
-        main(args.filename, args.verbose)
+        with instrumented(globals(), args):
+            main(args.filename, args.verbose)
     except KeyboardInterrupt:
         pass
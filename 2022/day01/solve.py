@@ -1,32 +1,75 @@
 #!/usr/bin/env python
 import sys
+from argparse import ArgumentParser
+from heapq import heappush, heappushpop
+from itertools import chain
+from pathlib import Path
+from typing import Iterable, Union
 
+import numpy as np
 
-def parse(filename: str) -> list[list[int]]:
-    with open(filename) as f:
-        inventories = []
-        current: list[int] = []
-        for line in f.readlines():
-            try:
-                current.append(int(line))
-            except ValueError:
-                # End of current inventory, starting next elf's
-                inventories.append(current)
-                current = []
-        inventories.append(current)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from aoc.load import int_blocks, lines, read  # noqa: E402
 
-    return inventories
 
+def parse(filename: str) -> list[np.ndarray]:
+    return int_blocks(read(filename))
 
-def main(filename: str) -> None:
-    inventories = parse(filename)
 
-    tops = sorted((sum(inventory) for inventory in inventories), reverse=True)
+def top_calories(inventories: list[np.ndarray], n: int = 3) -> list[int]:
+    return sorted((int(inventory.sum()) for inventory in inventories),
+                  reverse=True)[:n]
+
+
+def part1(inventories: list[np.ndarray]) -> int:
+    return top_calories(inventories, 1)[0]
+
+
+def part2(inventories: list[np.ndarray],
+          breakdown: bool = False) -> Union[int, list[int]]:
+    """Total of the top three, or the three of them with ``breakdown``."""
+    tops = top_calories(inventories, 3)
+    return tops if breakdown else sum(tops)
+
+
+def stream(lines: Iterable[str], n: int = 3) -> list[int]:
+    """Top calories in one pass, only keeping the top and current totals."""
+    tops: list[int] = []
+    current = 0
+    # A last blank line ends the last inventory
+    for line in chain(lines, ['']):
+        if line:
+            current += int(line)
+            continue
+        if len(tops) < n:
+            heappush(tops, current)
+        else:
+            heappushpop(tops, current)
+        current = 0
+    return sorted(tops, reverse=True)
+
+
+def main(filename: str, streaming: bool = False) -> None:
+    if streaming:
+        tops = stream(lines(filename), 3)
+    else:
+        inventories = parse(filename)
+        tops = [part1(inventories), *part2(inventories, breakdown=True)[1:]]
+
     print(f"The elf carrying the most Calories has {tops[0]} Calories.")
     print("The three elf carrying the most Calories have "
           f"{tops[0]}, {tops[1]} and {tops[2]} Calories "
-          f"for a total of {sum(tops[:3])} Calories.")
+          f"for a total of {sum(tops)} Calories.")
 
 
 if __name__ == "__main__":
-    main(sys.argv[1])
+    from aoc.instrument import add_arguments, instrumented
+
+    parser = ArgumentParser()
+    parser.add_argument('filename', help='input file, - for stdin with --stream')
+    parser.add_argument('--stream', action='store_true',
+                        help='solve while reading the input line by line')
+    add_arguments(parser)
+    args = parser.parse_args()
+    with instrumented(globals(), args):
+        main(args.filename, args.stream)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+"""Record benchmark baselines and check later runs against them.
+
+The baseline file keeps every recorded run so that the history of a
+solver's timings can be looked at; checks compare each input against the
+last run that recorded it.
+"""
+import json
+import platform
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from aoc import ROOT
+from aoc.runner import Day, discover, run_isolated, select
+
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = ROOT / 'baseline.json'
+# Years whose test files are checked alongside input.txt
+TEST_YEARS = (2021,)
+
+
+def inputs(day: Day) -> Iterator[Path]:
+    folder = day.path.parent
+    if day.input.exists():
+        yield day.input
+    if day.year in TEST_YEARS:
+        yield from sorted(folder.glob('test*.txt'))
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench(days: list[Day],
+          repeat: int = 1,
+          budget: Optional[float] = None) -> dict[str, Any]:
+    """Measure every day on each of its inputs.
+
+    Timings are the best of ``repeat`` runs without tracemalloc, peak
+    memory comes from one extra traced run.
+    """
+    entries = {}
+    for day in days:
+        for filename in inputs(day):
+            key = f'{day.name}/{filename.name}'
+            phases: dict[str, dict[str, Any]] = {}
+            runs = [run_isolated(day, filename, False, budget)
+                    for _ in range(repeat)]
+            traced = run_isolated(day, filename, True, budget)
+            for result in runs:
+                for m in result.measures:
+                    phase = phases.setdefault(m.phase, {'wall': m.wall,
+                                                        'cpu': m.cpu})
+                    phase['wall'] = min(phase['wall'], m.wall)
+                    phase['cpu'] = min(phase['cpu'], m.cpu)
+                    phase['answer'] = m.answer
+            for m in traced.measures:
+                if m.phase in phases:
+                    phases[m.phase]['peak'] = m.peak
+            entries[key] = {
+                'phases': phases,
+                'error': runs[-1].error or traced.error,
+            }
+            print(f'{key}: '
+                  + ', '.join(f'{p} {v["wall"]:.4f}s'
+                              for p, v in phases.items())
+                  + (f' ({entries[key]["error"]})'
+                     if entries[key]['error'] else ''),
+                  file=sys.stderr)
+    return entries
+
+
+def load(filename: Path) -> dict[str, Any]:
+    try:
+        with open(filename) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        return {'version': BASELINE_VERSION, 'runs': []}
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f'{filename}: unsupported baseline version '
+                         f'{baseline.get("version")}')
+    return baseline
+
+
+def record(filename: Path, entries: dict[str, Any]) -> None:
+    baseline = load(filename)
+    baseline['runs'].append({
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'entries': entries,
+    })
+    with open(filename, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def reference(baseline: dict[str, Any]) -> dict[str, Any]:
+    """Latest recorded entry of every input across the baseline history."""
+    entries = {}
+    for run in baseline['runs']:
+        entries.update(run['entries'])
+    return entries
+
+
+def compare(reference: dict[str, Any],
+            entries: dict[str, Any],
+            ratio: float = 1.25,
+            min_time: float = 0.005,
+            min_peak: int = 64 * 1024) -> list[str]:
+    """List regressions of ``entries`` against a ``reference`` run.
+
+    Phases faster than ``min_time`` or allocating less than ``min_peak`` in
+    both runs are too noisy to be compared on their timings or memory.
+    """
+    regressions = []
+    for key, entry in entries.items():
+        if key not in reference:
+            continue
+        if entry['error'] and not reference[key]['error']:
+            regressions.append(f'{key}: {entry["error"]}')
+        for phase, new in entry['phases'].items():
+            old = reference[key]['phases'].get(phase)
+            if not old:
+                continue
+            if new.get('answer') != old.get('answer'):
+                regressions.append(f'{key} {phase}: answer changed from '
+                                   f'{old.get("answer")!r} to '
+                                   f'{new.get("answer")!r}')
+            if (max(old['wall'], new['wall']) >= min_time
+                    and new['wall'] > old['wall'] * ratio):
+                regressions.append(f'{key} {phase}: {new["wall"]:.4f}s, '
+                                   f'{new["wall"] / old["wall"]:.2f}x slower '
+                                   f'than {old["wall"]:.4f}s')
+            if (old.get('peak') and new.get('peak')
+                    and max(old['peak'], new['peak']) >= min_peak
+                    and new['peak'] > old['peak'] * ratio):
+                regressions.append(f'{key} {phase}: peak memory '
+                                   f'{new["peak"]}B, '
+                                   f'{new["peak"] / old["peak"]:.2f}x '
+                                   f'more than {old["peak"]}B')
+    return regressions
+
+
+def main(selectors: list[str],
+         baseline_file: Path,
+         update: bool,
+         ratio: float,
+         min_time: float,
+         repeat: int,
+         budget: Optional[float]) -> int:
+    baseline = load(baseline_file)
+    entries = bench(select(discover(), selectors), repeat, budget)
+
+    if update or not baseline['runs']:
+        record(baseline_file, entries)
+        print(f'Recorded {len(entries)} entries in {baseline_file}')
+        return 0
+
+    regressions = compare(reference(baseline), entries, ratio, min_time)
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        print(f'\n{len(regressions)} regressions over {ratio}x')
+        return 1
+    print(f'No regression over {ratio}x on {len(entries)} entries')
+    return 0
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('days', nargs='*',
+                        help='years or days to run, e.g. 2021 or 2021/day14')
+    parser.add_argument('--baseline', '-B', type=Path,
+                        default=DEFAULT_BASELINE,
+                        help=f'baseline file (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--update', '-u', action='store_true',
+                        help='record this run in the baseline history')
+    parser.add_argument('--ratio', '-r', type=float, default=1.25,
+                        help='slowdown ratio over which to fail '
+                             '(default: 1.25)')
+    parser.add_argument('--min-time', type=float, default=0.005,
+                        help='ignore timings of phases faster than this')
+    parser.add_argument('--repeat', '-n', type=int, default=3,
+                        help='keep the best of N timed runs (default: 3)')
+    parser.add_argument('--budget', '-b', type=float, metavar='SECONDS',
+                        help='kill and report any day running longer')
+    args = parser.parse_args()
+    try:
+        sys.exit(main(args.days, args.baseline, args.update, args.ratio,
+                      args.min_time, args.repeat, args.budget))
+    except KeyboardInterrupt:
+        pass
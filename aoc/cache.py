@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""Content-addressed cache of parsed inputs and answers.
+
+Entries are keyed by the hashes of the solver source, of the shared
+``aoc`` modules it may use and of the input bytes, so editing a solver
+only invalidates its own entries while editing a helper invalidates them
+all. The least recently used entries are evicted once the cache grows
+over its size.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Iterable, Optional, TYPE_CHECKING
+
+from aoc import ROOT
+
+if TYPE_CHECKING:
+    from aoc.runner import Day
+
+
+DEFAULT_DIRECTORY = ROOT / '.cache'
+DEFAULT_MAX_SIZE = 256 * 1024 ** 2
+HELPERS = ROOT / 'aoc'
+
+
+def file_hash(filename: Path) -> str:
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
+
+def files_hash(filenames: Iterable[Path]) -> str:
+    digest = hashlib.sha256()
+    for filename in filenames:
+        digest.update(file_hash(filename).encode())
+    return digest.hexdigest()[:32]
+
+
+class Cache:
+    def __init__(self,
+                 directory: Path = DEFAULT_DIRECTORY,
+                 max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.helpers = sorted(HELPERS.glob('*.py'))
+
+    def key(self, day: 'Day', filename: Path) -> str:
+        return (f'{day.year}-day{day.day:02d}/'
+                f'{files_hash([day.path, *self.helpers])}-'
+                f'{file_hash(filename)}')
+
+    def _path(self, key: str, kind: str) -> Path:
+        return self.directory / f'{key}.{kind}.pickle'
+
+    def get(self, key: str, kind: str) -> Optional[Any]:
+        path = self._path(key, kind)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return None
+        # Bump access time for the LRU eviction
+        os.utime(path)
+        return value
+
+    def put(self, key: str, kind: str, value: Any) -> bool:
+        path = self._path(key, kind)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return False
+
+        # Entries of an older version of the same solver are dead weight
+        source_hash = path.name.split('-', 1)[0]
+        for old in path.parent.glob('*.pickle'):
+            if not old.name.startswith(source_hash):
+                old.unlink(missing_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.evict()
+        return True
+
+    def entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob('*/*.pickle'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self) -> None:
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for _, _, path in self.entries():
+            path.unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--directory', '-d', type=Path,
+                        default=DEFAULT_DIRECTORY)
+    parser.add_argument('--clear', action='store_true',
+                        help='remove every cached entry')
+    args = parser.parse_args()
+
+    cache = Cache(args.directory)
+    if args.clear:
+        cache.clear()
+    print(f'{len(cache.entries())} entries, '
+          f'{cache.size / 1024 ** 2:.1f}MiB in {cache.directory}')
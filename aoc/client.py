@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""Thin client of the solver daemon from aoc.server.
+
+Only uses the standard library so that it starts as fast as possible.
+"""
+import json
+import socket
+import sys
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Optional
+
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / 'aoc-solver.sock'
+
+
+def send(message: dict[str, Any],
+         socket_path: Path = DEFAULT_SOCKET) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        with sock.makefile('rb') as f:
+            return json.loads(f.readline())
+
+
+def request(day: str,
+            path: Optional[str] = None,
+            text: Optional[str] = None,
+            socket_path: Path = DEFAULT_SOCKET,
+            budget: Optional[float] = None) -> dict[str, Any]:
+    message: dict[str, Any] = {'day': day}
+    if text is not None:
+        message['input'] = text
+    elif path is not None:
+        message['path'] = str(Path(path).resolve())
+    if budget:
+        message['budget'] = budget
+    return send(message, socket_path)
+
+
+def main(day: str,
+         filename: Optional[str],
+         socket_path: Path,
+         budget: Optional[float],
+         verbose: int) -> int:
+    if filename == '-':
+        response = request(day, text=sys.stdin.read(),
+                           socket_path=socket_path, budget=budget)
+    else:
+        response = request(day, filename, socket_path=socket_path,
+                           budget=budget)
+
+    for m in response.get('measures', []):
+        if verbose:
+            print(f'{m["phase"]}: {m["wall"]:.4f}s', end='')
+            print(f' -> {m["answer"]}' if m['answer'] is not None else '')
+        elif m['answer'] is not None:
+            print(f'{m["phase"]}: {m["answer"]}')
+    if response.get('error'):
+        print(f'error: {response["error"]}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('day', help='day to solve, e.g. 2021/day14')
+    parser.add_argument('filename', nargs='?',
+                        help='input file, - for stdin (default: the day '
+                             'input.txt)')
+    parser.add_argument('--socket', '-s', type=Path, default=DEFAULT_SOCKET)
+    parser.add_argument('--budget', '-b', type=float, metavar='SECONDS')
+    parser.add_argument('--verbose', '-v', action='count', default=0)
+    args = parser.parse_args()
+    sys.exit(main(args.day, args.filename, args.socket, args.budget,
+                  args.verbose))
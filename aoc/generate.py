@@ -0,0 +1,532 @@
+#!/usr/bin/env python
+"""Generate valid puzzle inputs of any size to see how solvers scale.
+
+Every generator takes a size ``n`` (lines, records or grid side depending
+on the puzzle) and a seeded ``Random`` so that runs are reproducible.
+"""
+import json
+import string
+import sys
+import tempfile
+from argparse import ArgumentParser
+from dataclasses import asdict
+from math import ceil, log2
+from pathlib import Path
+from random import Random
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from aoc.grid import Grid
+from aoc.runner import discover, run_isolated, select
+
+
+Generator = Callable[[int, Random], str]
+GENERATORS: dict[str, Generator] = {}
+
+
+def generator(name: str) -> Callable[[Generator], Generator]:
+    def register(func: Generator) -> Generator:
+        GENERATORS[name] = func
+        return func
+    return register
+
+
+def generate(name: str, n: int, seed: int = 0) -> str:
+    try:
+        func = GENERATORS[name]
+    except KeyError:
+        raise ValueError(f'No input generator for {name}') from None
+    return func(n, Random(seed))
+
+
+def digit_grid(n: int, rng: Random, digits: str = '123456789') -> str:
+    return ''.join(''.join(rng.choices(digits, k=n)) + '\n'
+                   for _ in range(n))
+
+
+@generator('2020/day04')
+def passports(n: int, rng: Random) -> str:
+    fields = {
+        'byr': lambda: str(rng.randint(1900, 2010)),
+        'iyr': lambda: str(rng.randint(2005, 2025)),
+        'eyr': lambda: str(rng.randint(2015, 2035)),
+        'hgt': lambda: rng.choice([f'{rng.randint(140, 200)}cm',
+                                   f'{rng.randint(50, 80)}in',
+                                   str(rng.randint(50, 200))]),
+        'hcl': lambda: rng.choice(['#', '']) + ''.join(
+            rng.choices('0123456789abcdef', k=6)),
+        'ecl': lambda: rng.choice(['amb', 'blu', 'brn', 'gry', 'grn', 'hzl',
+                                   'oth', 'xry']),
+        'pid': lambda: ''.join(rng.choices(string.digits,
+                                           k=rng.choice([9, 9, 9, 10]))),
+        'cid': lambda: str(rng.randint(100, 350)),
+    }
+    records = []
+    for _ in range(n):
+        present = [f for f in fields if f == 'cid' or rng.random() < 0.95]
+        rng.shuffle(present)
+        tokens = [f'{f}:{fields[f]()}' for f in present]
+        lines, line = [], []
+        for token in tokens:
+            line.append(token)
+            if rng.random() < 0.3:
+                lines.append(' '.join(line))
+                line = []
+        if line:
+            lines.append(' '.join(line))
+        records.append('\n'.join(lines) + '\n')
+    return '\n'.join(records)
+
+
+@generator('2020/day05')
+def boarding_passes(n: int, rng: Random) -> str:
+    # Seat IDs are read as plain binary numbers, so longer passes than the
+    # 10 characters of the puzzle give room for any number of seats.
+    n = max(n, 2)
+    bits = max(10, ceil(log2(n + 3)))
+    start = rng.randint(1, 2 ** bits - n - 2)
+    missing = rng.randint(start + 1, start + n - 1)
+    ids = [i for i in range(start, start + n + 1) if i != missing]
+    rng.shuffle(ids)
+    table = str.maketrans('01', 'FB')
+    return ''.join(
+        f'{i >> 3:0{bits - 3}b}'.translate(table)
+        + f'{i & 7:03b}'.translate(str.maketrans('01', 'LR')) + '\n'
+        for i in ids
+    )
+
+
+@generator('2020/day06')
+def customs_answers(n: int, rng: Random) -> str:
+    groups = []
+    for _ in range(n):
+        groups.append(''.join(
+            ''.join(rng.sample(string.ascii_lowercase, rng.randint(1, 26)))
+            + '\n'
+            for _ in range(rng.randint(1, 5))
+        ))
+    return '\n'.join(groups)
+
+
+@generator('2020/day07')
+def bag_rules(n: int, rng: Random) -> str:
+    adjectives = ['light', 'dark', 'bright', 'muted', 'faded', 'dotted',
+                  'vibrant', 'pale', 'wavy', 'striped', 'dim', 'clear']
+    colors = ['red', 'orange', 'white', 'yellow', 'gold', 'olive', 'plum',
+              'blue', 'black', 'tan', 'cyan', 'lime', 'teal', 'violet']
+    names = [f'{rng.choice(adjectives)} {rng.choice(colors)}{i}'
+             for i in range(n - 1)]
+    # Rules form a DAG along this ordering, with the shiny gold bag inside
+    names.insert(n // 2, 'shiny gold')
+    lines = []
+    for i, name in enumerate(names):
+        inners = sorted(set(rng.randrange(i + 1, n)
+                            for _ in range(rng.randint(0, 4))
+                            if i + 1 < n))
+        if not inners:
+            content = 'no other bags'
+        else:
+            content = ', '.join(
+                f'{q} {names[j]} bag{"s" if q > 1 else ""}'
+                for j in inners
+                for q in [rng.randint(1, 5)]
+            )
+        lines.append(f'{name} bags contain {content}.\n')
+    rng.shuffle(lines)
+    return ''.join(lines)
+
+
+@generator('2020/day08')
+def boot_code(n: int, rng: Random) -> str:
+    """Program looping forever unless its single faulty jmp is flipped.
+
+    The first ``m`` instructions loop through a final ``jmp`` back into
+    them. Every other ``nop`` there points backwards and every ``jmp``
+    stays inside that block, so the only way out is to turn the final
+    ``jmp`` into a ``nop`` and run the straight-line tail to the end.
+    """
+    n = max(n, 4)
+    m = rng.randint(2, n - 2)
+    code = []
+    for i in range(m - 1):
+        op = rng.choice(['acc', 'acc', 'nop', 'jmp'])
+        if op == 'acc':
+            code.append(f'acc {rng.randint(-50, 50):+d}')
+        elif op == 'nop':
+            code.append(f'nop {-rng.randint(0, i):+d}')
+        else:
+            code.append(f'jmp {rng.randint(1, m - 1 - i):+d}')
+    code.append(f'jmp {-rng.randint(1, m - 1):+d}')
+    for i in range(m, n):
+        op = rng.choice(['acc', 'acc', 'nop', 'jmp'])
+        if op == 'acc':
+            code.append(f'acc {rng.randint(-50, 50):+d}')
+        elif op == 'nop':
+            code.append(f'nop {rng.randint(-i, n - i):+d}')
+        else:
+            code.append(f'jmp {rng.randint(1, min(n - i, 5)):+d}')
+    return '\n'.join(code) + '\n'
+
+
+def closest_pair_sum(window: list[int], target: int) -> int:
+    values = sorted(window)
+    i, j = 0, len(values) - 1
+    best = values[0] + values[1]
+    while i < j:
+        pair = values[i] + values[j]
+        if abs(pair - target) < abs(best - target):
+            best = pair
+        if pair < target:
+            i += 1
+        elif pair > target:
+            j -= 1
+        else:
+            break
+    return best
+
+
+@generator('2020/day09')
+def xmas(n: int, rng: Random, preamble: int = 25, bound: int = 10 ** 9) -> str:
+    # Sums of random pairs would grow exponentially with n, so each number
+    # is the pair sum closest to a random target, which keeps the stream
+    # mixing signs around [-bound, bound].
+    buf = [rng.randint(-bound, bound) for _ in range(preamble)]
+    invalid_at = max(preamble + 1, 3 * n // 4)
+    while len(buf) < max(n, invalid_at + 1):
+        window = buf[-preamble:]
+        if len(buf) == invalid_at:
+            sums = {a + b for i, a in enumerate(window) for b in window[i:]}
+            while True:
+                i = rng.randrange(len(buf) - 2)
+                j = rng.randint(i + 2, min(len(buf), i + 20))
+                target = sum(buf[i:j])
+                if target not in sums:
+                    break
+            buf.append(target)
+        else:
+            buf.append(closest_pair_sum(window,
+                                        rng.randint(-bound, bound)))
+    return ''.join(f'{v}\n' for v in buf)
+
+
+@generator('2020/day10')
+def adapters(n: int, rng: Random) -> str:
+    joltages = []
+    joltage = 0
+    for _ in range(n):
+        joltage += rng.choice([1, 1, 1, 2, 3, 3])
+        joltages.append(joltage)
+    rng.shuffle(joltages)
+    return ''.join(f'{j}\n' for j in joltages)
+
+
+def settled(ca: Any, steps: int) -> bool:
+    return any(not ca.step() for _ in range(steps))
+
+
+@generator('2020/day11')
+def seat_layout(n: int, rng: Random, tile: int = 8) -> str:
+    """Random seats which settle under both seating rules.
+
+    Most large random layouts flip back and forth forever under the
+    adjacent rule, so seats come in ``tile`` wide squares with a line of
+    floor around them, which the adjacent rule can't see across. Squares
+    still changing after a while are redrawn, and the whole layout if the
+    rule of sight doesn't settle.
+    """
+    solver = select(discover(), ['2020/day11'])[0].load()
+    side = tile + 1
+    count = ceil(n / side)
+    cells = np.full((count * side, count * side), ord('.'), np.uint8)
+    squares = cells.reshape(count, side, count, side)
+    redraw = {(i, j) for i in range(count) for j in range(count)}
+    while True:
+        for i, j in sorted(redraw):
+            squares[i, :tile, j, :tile] = np.frombuffer(
+                ''.join(rng.choices('LLLLL.', k=tile * tile)).encode(),
+                np.uint8).reshape(tile, tile)
+        layout = cells[:n, :n]
+
+        ca = solver.CellularAutomata(Grid(layout.copy()), solver.ADJACENT, 4)
+        if not settled(ca, 2 * tile * tile):
+            before = ca.occupied.copy()
+            ca.step()
+            y, x = np.divmod(ca.positions[(ca.occupied != before)[:-1]], n)
+            redraw = set(zip((y // side).tolist(), (x // side).tolist()))
+            continue
+        ca = solver.CellularAutomata(Grid(layout.copy()), solver.SIGHT, 5)
+        if settled(ca, 4 * n + 100):
+            return ''.join(row.tobytes().decode() + '\n' for row in layout)
+        redraw = {(i, j) for i in range(count) for j in range(count)}
+
+
+@generator('2020/day12')
+def navigation(n: int, rng: Random) -> str:
+    lines = []
+    for _ in range(n):
+        action = rng.choice('NSEWLRFFF')
+        if action in 'LR':
+            lines.append(f'{action}{rng.choice([90, 180, 270])}\n')
+        else:
+            lines.append(f'{action}{rng.randint(1, 100)}\n')
+    return ''.join(lines)
+
+
+def primes(count: int, start: int = 11) -> list[int]:
+    found: list[int] = []
+    candidate = start
+    while len(found) < count:
+        if all(candidate % p for p in range(2, int(candidate ** .5) + 1)):
+            found.append(candidate)
+        candidate += 1
+    return found
+
+
+@generator('2020/day13')
+def bus_notes(n: int, rng: Random) -> str:
+    buses = primes(n)
+    rng.shuffle(buses)
+    schedule = []
+    for bus in buses:
+        schedule.extend(['x'] * rng.randint(0, 8))
+        schedule.append(str(bus))
+    return f'{rng.randint(10 ** 5, 10 ** 7)}\n{",".join(schedule)}\n'
+
+
+@generator('2020/day16')
+def tickets(n: int, rng: Random, n_fields: int = 20) -> str:
+    """Tickets whose field order can be deduced by elimination.
+
+    Field ``f`` accepts nested ranges growing with ``f`` and its column
+    only holds values from the slice no earlier field accepts, so column
+    candidates form a staircase.
+    """
+    def slices(f: int) -> list[tuple[int, int]]:
+        return [(41 + 10 * f, 50 + 10 * f), (591 + 10 * f, 600 + 10 * f)]
+
+    names = ([f'departure {w}' for w in ('location', 'station', 'platform',
+                                         'track', 'date', 'time')]
+             + [f'field {i}' for i in range(n_fields - 6)])
+    rules = [f'{name}: 1-{50 + 10 * f} or 500-{600 + 10 * f}\n'
+             for f, name in enumerate(names)]
+    order = list(range(n_fields))
+    rng.shuffle(order)
+
+    def ticket() -> str:
+        return ','.join(str(rng.randint(*rng.choice(slices(f))))
+                        for f in order)
+
+    nearby = []
+    for _ in range(n):
+        values = ticket().split(',')
+        if rng.random() < 0.25:
+            values[rng.randrange(n_fields)] = str(rng.randint(1000, 9999))
+        nearby.append(','.join(values) + '\n')
+    return (''.join(rules) + '\nyour ticket:\n' + ticket() + '\n'
+            + '\nnearby tickets:\n' + ''.join(nearby))
+
+
+@generator('2021/day01')
+def depths(n: int, rng: Random) -> str:
+    depth = rng.randint(100, 200)
+    lines = []
+    for _ in range(n):
+        depth = max(0, depth + rng.randint(-5, 10))
+        lines.append(f'{depth}\n')
+    return ''.join(lines)
+
+
+@generator('2021/day02')
+def course(n: int, rng: Random) -> str:
+    return ''.join(f'{rng.choice(["forward", "forward", "down", "up"])} '
+                   f'{rng.randint(1, 9)}\n' for _ in range(n))
+
+
+@generator('2021/day05')
+def vent_lines(n: int, rng: Random, extent: int = 1000) -> str:
+    lines = []
+    for _ in range(n):
+        x1, y1 = rng.randrange(extent), rng.randrange(extent)
+        kind = rng.choice('hvd')
+        length = rng.randint(1, extent // 2)
+        if kind == 'h':
+            x2, y2 = min(max(x1 + rng.choice([-1, 1]) * length, 0),
+                         extent - 1), y1
+        elif kind == 'v':
+            x2, y2 = x1, min(max(y1 + rng.choice([-1, 1]) * length, 0),
+                             extent - 1)
+        else:
+            dx, dy = rng.choice([-1, 1]), rng.choice([-1, 1])
+            length = min(length,
+                         x1 if dx < 0 else extent - 1 - x1,
+                         y1 if dy < 0 else extent - 1 - y1)
+            x2, y2 = x1 + dx * length, y1 + dy * length
+        lines.append(f'{x1},{y1} -> {x2},{y2}\n')
+    return ''.join(lines)
+
+
+def walls(n: int, rng: Random) -> list[int]:
+    positions, i = [], -1
+    while i < n:
+        positions.append(i)
+        i += rng.randint(3, 9)
+    return positions + [n]
+
+
+@generator('2021/day09')
+def heightmap(n: int, rng: Random) -> str:
+    # Like the puzzle, basins are walled by 9s and slope down to a single
+    # low point each.
+    grid = [[9] * n for _ in range(n)]
+    rows, cols = walls(n, rng), walls(n, rng)
+    for top, bottom in zip(rows, rows[1:]):
+        for left, right in zip(cols, cols[1:]):
+            if bottom - top < 2 or right - left < 2:
+                continue
+            cy = rng.randrange(top + 1, bottom)
+            cx = rng.randrange(left + 1, right)
+            for y in range(top + 1, min(bottom, n)):
+                for x in range(left + 1, min(right, n)):
+                    grid[y][x] = min(8, abs(y - cy) + abs(x - cx))
+    return ''.join(''.join(map(str, row)) + '\n' for row in grid)
+
+
+@generator('2021/day10')
+def navigation_subsystem(n: int, rng: Random) -> str:
+    pairs = {'(': ')', '[': ']', '{': '}', '<': '>'}
+    lines = []
+    for _ in range(n):
+        line, stack = [], []
+        for _ in range(rng.randint(20, 110)):
+            if stack and rng.random() < 0.45:
+                line.append(stack.pop())
+            else:
+                c = rng.choice('([{<')
+                line.append(c)
+                stack.append(pairs[c])
+        if stack and rng.random() < 0.5:
+            # Corrupt the line with a wrong closing character
+            line.append(rng.choice([c for c in ')]}>' if c != stack[-1]]))
+        elif not stack:
+            line.append(rng.choice('([{<'))
+        lines.append(''.join(line) + '\n')
+    return ''.join(lines)
+
+
+@generator('2021/day12')
+def cave_graph(n: int, rng: Random) -> str:
+    # Big caves are never linked together, else paths would be infinite
+    small = [f'{c}{i}' for i, c in enumerate(
+        rng.choices(string.ascii_lowercase, k=max(1, 2 * n // 3)))]
+    big = [f'{c}{i}' for i, c in enumerate(
+        rng.choices(string.ascii_uppercase, k=max(1, n // 3)))]
+    edges = set()
+    for cave in big:
+        for other in rng.sample(small, min(len(small), 3)):
+            edges.add((cave, other))
+    for cave in small:
+        edges.add((cave, rng.choice(small + big)))
+    for end in ('start', 'end'):
+        for cave in rng.sample(small + big, min(2, len(small + big))):
+            edges.add((end, cave))
+    return ''.join(f'{a}-{b}\n' for a, b in edges if a != b)
+
+
+@generator('2021/day14')
+def polymer(n: int, rng: Random, elements: str = 'BCFHKNOPSV') -> str:
+    template = ''.join(rng.choices(elements, k=max(2, n)))
+    rules = ''.join(f'{a}{b} -> {rng.choice(elements)}\n'
+                    for a in elements for b in elements)
+    return f'{template}\n\n{rules}'
+
+
+@generator('2021/day15')
+def risk_grid(n: int, rng: Random) -> str:
+    return digit_grid(n, rng)
+
+
+@generator('2021/day22')
+def reboot_steps(n: int, rng: Random) -> str:
+    lines = []
+    for i in range(n):
+        # The first steps stay in the initialization region like the puzzle
+        extent, size = (50, 50) if i < n // 10 + 1 else (100000, 30000)
+        ranges = []
+        for _ in 'xyz':
+            low = rng.randint(-extent, extent - 1)
+            ranges.append((low, min(extent, low + rng.randint(0, size))))
+        state = 'on' if i == 0 or rng.random() < 0.6 else 'off'
+        (x1, x2), (y1, y2), (z1, z2) = ranges
+        lines.append(f'{state} x={x1}..{x2},y={y1}..{y2},z={z1}..{z2}\n')
+    return ''.join(lines)
+
+
+@generator('2022/day01')
+def calories(n: int, rng: Random) -> str:
+    return '\n'.join(
+        ''.join(f'{rng.randint(1000, 70000)}\n'
+                for _ in range(rng.randint(1, 15)))
+        for _ in range(max(3, n))
+    )
+
+
+def scale(selectors: list[str],
+          sizes: list[int],
+          seed: int = 0,
+          budget: Optional[float] = None) -> list[dict]:
+    """Run selected days on generated inputs of every size."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for day in select(discover(), selectors):
+            if day.name not in GENERATORS:
+                continue
+            for n in sizes:
+                filename = Path(tmp) / f'{day.year}_day{day.day:02d}_{n}.txt'
+                filename.write_text(generate(day.name, n, seed))
+                result = run_isolated(day, filename, False, budget)
+                rows.append({'day': day.name, 'n': n, **asdict(result)})
+                print(f'{day.name} n={n}: '
+                      + ', '.join(f'{m.phase} {m.wall:.4f}s'
+                                  for m in result.measures)
+                      + (f' ({result.error})' if result.error else ''),
+                      file=sys.stderr)
+                if result.error:
+                    # Larger sizes would only fail the same way, slower
+                    break
+    return rows
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('days', nargs='*',
+                        help='years or days, e.g. 2021 or 2021/day05')
+    parser.add_argument('--size', '-n', type=int, nargs='+', default=[1000],
+                        help='size of the generated input(s)')
+    parser.add_argument('--seed', '-s', type=int, default=0)
+    parser.add_argument('--output', '-o',
+                        help='write the generated input of a single day '
+                             'to this file instead of stdout')
+    parser.add_argument('--run', '-r', action='store_true',
+                        help='time the solvers on every size and print '
+                             'the results as JSON')
+    parser.add_argument('--budget', '-b', type=float, metavar='SECONDS',
+                        help='with --run, kill and report any run longer')
+    args = parser.parse_args()
+
+    if args.run:
+        json.dump(scale(args.days, args.size, args.seed, args.budget),
+                  sys.stdout, indent=2)
+        print()
+    elif len(args.days) != 1 or len(args.size) != 1:
+        parser.error('generating an input needs a single day and size')
+    else:
+        try:
+            text = generate(args.days[0], args.size[0], args.seed)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text)
+        else:
+            sys.stdout.write(text)
@@ -0,0 +1,110 @@
+"""Two-dimensional grids of small integers backed by NumPy arrays.
+
+Cells are stored in one contiguous array indexed ``[y, x]``. Neighbors
+are read through views of a padded copy, so that solvers never have to
+check bounds: the padding holds a fill value chosen to be neutral for
+the puzzle (a wall, an empty seat, ...).
+"""
+from typing import Iterable
+
+import numpy as np
+
+from aoc.load import char_matrix, digit_matrix, read
+
+
+# (dy, dx) offsets of the neighbors of a cell, in row-major order
+NEIGHBORS4 = ((-1, 0), (0, -1), (0, 1), (1, 0))
+NEIGHBORS8 = ((-1, -1), (-1, 0), (-1, 1),
+              (0, -1), (0, 1),
+              (1, -1), (1, 0), (1, 1))
+
+Offsets = Iterable[tuple[int, int]]
+
+
+def neighbor_views(values: np.ndarray,
+                   offsets: Offsets = NEIGHBORS8,
+                   fill: int = 0) -> list[np.ndarray]:
+    """Views of ``values`` shifted by each offset, ``fill`` past the edges."""
+    padded = np.pad(values, 1, constant_values=fill)
+    h, w = values.shape
+    return [padded[1 + dy:1 + dy + h, 1 + dx:1 + dx + w]
+            for dy, dx in offsets]
+
+
+def neighbor_sum(values: np.ndarray,
+                 offsets: Offsets = NEIGHBORS8,
+                 dtype: type = np.uint8) -> np.ndarray:
+    """Sum of the neighbors of every cell, counting 0 past the edges."""
+    total = np.zeros(values.shape, dtype)
+    for view in neighbor_views(values, offsets):
+        total += view
+    return total
+
+
+class Grid:
+    def __init__(self, cells: np.ndarray, offset: int = 0) -> None:
+        if cells.ndim != 2:
+            raise ValueError(f'Expected 2 dimensions, got {cells.ndim}')
+        self.cells = np.ascontiguousarray(cells)
+        # Character code of the cell value 0, to print the grid back
+        self.offset = offset
+
+    @classmethod
+    def from_chars(cls, filename: str) -> 'Grid':
+        return cls(char_matrix(read(filename)))
+
+    @classmethod
+    def from_digits(cls, filename: str, dtype: type = np.uint8) -> 'Grid':
+        return cls(digit_matrix(read(filename), dtype), ord('0'))
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.cells.shape
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def size(self) -> int:
+        return self.cells.size
+
+    def copy(self) -> 'Grid':
+        return type(self)(self.cells.copy(), self.offset)
+
+    def padded(self, fill: int = 0, width: int = 1) -> np.ndarray:
+        return np.pad(self.cells, width, constant_values=fill)
+
+    def neighbors(self,
+                  offsets: Offsets = NEIGHBORS8,
+                  fill: int = 0) -> list[np.ndarray]:
+        return neighbor_views(self.cells, offsets, fill)
+
+    def flat_offsets(self, offsets: Offsets = NEIGHBORS4,
+                     width: int = 1) -> list[int]:
+        """Offsets of the neighbors in ``padded(fill, width).ravel()``."""
+        stride = self.width + 2 * width
+        return [dy * stride + dx for dy, dx in offsets]
+
+    def flat_index(self, y: int, x: int, width: int = 1) -> int:
+        """Index of the cell ``(y, x)`` in ``padded(fill, width).ravel()``."""
+        return (y + width) * (self.width + 2 * width) + x + width
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __setitem__(self, key, value) -> None:
+        self.cells[key] = value
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return np.array_equal(self.cells, other.cells)
+
+    def __str__(self) -> str:
+        chars = (self.cells + self.offset).astype(np.uint8)
+        return '\n'.join(row.tobytes().decode() for row in chars)
@@ -0,0 +1,155 @@
+"""Instrumentation flags shared by every solver command line.
+
+Solvers add the flags to their parser and run ``main`` inside
+``instrumented(globals(), args)``, which wraps their ``parse``, ``part1``,
+``part2`` and ``stream`` functions to report on each phase separately::
+
+    --timings         wall and CPU time
+    --profile [FILE]  cProfile top functions, optionally dumped to
+                      FILE.<phase>.prof
+    --trace-malloc    peak memory and top allocating lines around the peak
+"""
+import _weakrefset
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+
+PHASES = ('parse', 'part1', 'part2', 'stream')
+# Allocations of the instrumentation itself
+IGNORED = [tracemalloc.Filter(False, path)
+           for path in (__file__, _weakrefset.__file__, threading.__file__,
+                        tracemalloc.__file__)]
+
+
+def add_arguments(parser: ArgumentParser) -> None:
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--timings', action='store_true',
+                       help='print wall and CPU time of each phase')
+    group.add_argument('--profile', nargs='?', const='', metavar='FILE',
+                       help='profile each phase, dumping stats to '
+                            'FILE.<phase>.prof if given')
+    group.add_argument('--trace-malloc', action='store_true',
+                       help='print peak memory and top allocating lines '
+                            'of each phase')
+    group.add_argument('--top', type=int, default=15, metavar='N',
+                       help='number of functions or lines to report '
+                            '(default: 15)')
+
+
+class PeakTracker(threading.Thread):
+    """Keep a tracemalloc snapshot taken close to the peak of memory usage.
+
+    tracemalloc only tells the peak size, so traced memory is polled and a
+    new snapshot is taken whenever it grew past the last snapshot.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.size = 0
+        self._done = threading.Event()
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.size * 1.05:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.size = current
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            self.sample()
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+        self.sample()
+
+
+def report(phase: str, lines: list[str]) -> None:
+    print(f'[{phase}] ' + '\n'.join(lines), file=sys.stderr)
+
+
+def instrument(phase: str, func: Callable, args: Namespace) -> Callable:
+    depth = 0
+
+    @wraps(func)
+    def wrapper(*a: Any, **kw: Any) -> Any:
+        nonlocal depth
+        # Recursive or nested calls are part of the outer measure
+        if depth:
+            return func(*a, **kw)
+
+        depth += 1
+        profiler = cProfile.Profile() if args.profile is not None else None
+        if args.trace_malloc:
+            tracemalloc.start()
+            tracker = PeakTracker()
+            tracker.start()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            return func(*a, **kw)
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            depth -= 1
+
+            if args.timings:
+                report(phase, [f'wall {wall:.4f}s, cpu {cpu:.4f}s'])
+            if profiler:
+                if args.profile:
+                    profiler.dump_stats(f'{args.profile}.{phase}.prof')
+                stats = pstats.Stats(profiler, stream=sys.stderr)
+                report(phase, ['profile:'])
+                stats.sort_stats('cumulative').print_stats(args.top)
+            if args.trace_malloc:
+                tracker.stop()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                stats = []
+                if tracker.snapshot:
+                    snapshot = tracker.snapshot.filter_traces(IGNORED)
+                    stats = snapshot.statistics('lineno')[:args.top]
+                report(phase, [f'peak memory {peak / 1024:.1f}KiB, '
+                               f'allocated by line at '
+                               f'{tracker.size / 1024:.1f}KiB:']
+                       + [f'    {stat}' for stat in stats])
+
+    return wrapper
+
+
+@contextmanager
+def instrumented(namespace: dict[str, Any],
+                 args: Namespace,
+                 phases: Iterable[str] = PHASES) -> Iterator[None]:
+    """Wrap the solver ``phases`` found in ``namespace`` while in context.
+
+    Solvers whose main does its work outside of the usual phases name the
+    functions doing it in ``phases`` to have them reported too.
+    """
+    if (not args.timings and args.profile is None
+            and not args.trace_malloc):
+        yield
+        return
+
+    originals = {phase: namespace[phase]
+                 for phase in phases if phase in namespace}
+    for phase, func in originals.items():
+        namespace[phase] = instrument(phase, func, args)
+    try:
+        yield
+    finally:
+        namespace.update(originals)
@@ -0,0 +1,217 @@
+"""Bulk input loading without a Python object per token.
+
+Inputs are memory-mapped and seen as one uint8 array, which is then cut
+into integer columns, digit or character matrices, or blank-line
+separated records with vectorized operations or NumPy's own parser::
+
+    depths = ints(read('input.txt'))
+    calories = int_blocks(read('input.txt'))
+    heights = digit_matrix(read('input.txt'))
+
+Solvers with a streaming mode take the ``lines`` of their input instead.
+Lines may end with ``\r\n``, which ``read`` turns into ``\n`` so that
+the functions below only have to deal with the latter.
+"""
+import mmap
+import sys
+import warnings
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+NEWLINE, RETURN, MINUS, ZERO = b'\n\r-0'
+INT64 = np.iinfo(np.int64)
+# Largest number of digits that always fits an int64
+MAX_DIGITS = 18
+
+
+def read(filename: str) -> np.ndarray:
+    """Map a file in memory as a read-only uint8 array.
+
+    The mapping is released once the array and all its views are gone,
+    unless the file has ``\r\n`` line endings, which are read as a copy
+    with ``\n`` line endings instead.
+    """
+    with open(filename, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return np.zeros(0, np.uint8)
+    data = np.frombuffer(mapped, np.uint8)
+    # Looking for a \r in the mapping doesn't allocate anything
+    if mapped.find(b'\r') != -1:
+        data = unix_newlines(data)
+    return data
+
+
+def unix_newlines(data: np.ndarray) -> np.ndarray:
+    """``data`` with its ``\r\n`` line endings turned into ``\n``, copied
+    only if it has any ``\r``."""
+    if not (data == RETURN).any():
+        return data
+    return np.frombuffer(data.tobytes().replace(b'\r\n', b'\n'), np.uint8)
+
+
+def rstrip(data: np.ndarray) -> np.ndarray:
+    end = data.size
+    while end and data[end - 1] <= ord(' '):
+        end -= 1
+    return data[:end]
+
+
+def _tokens(data: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start and end offsets of each run of digits."""
+    digits = np.zeros(data.size + 2, bool)
+    # Bytes below '0' wrap around and end up larger than 9 too
+    np.less(data - np.uint8(ZERO), 10, out=digits[1:-1])
+    changes = np.flatnonzero(digits[1:] != digits[:-1])
+    return changes[::2], changes[1::2]
+
+
+def _values(data: np.ndarray,
+            starts: np.ndarray,
+            ends: np.ndarray,
+            signed: bool) -> np.ndarray:
+    values = np.zeros(starts.size, np.int64)
+    if not starts.size:
+        return values
+    lengths = ends - starts
+    if lengths.max() > MAX_DIGITS:
+        raise OverflowError('Integer too large for int64')
+
+    # Horner's method over all the numbers at once, aligned on their
+    # last digit so that missing leading digits count as zeros
+    for k in range(lengths.max(), 0, -1):
+        offsets = ends - k
+        present = offsets >= starts
+        values *= np.where(present, 10, 1)
+        values += np.where(present, data[offsets] - np.uint8(ZERO), 0)
+    if signed:
+        before = np.maximum(starts - 1, 0)
+        values[(starts > 0) & (data[before] == MINUS)] *= -1
+    return values
+
+
+def _parse_numeric(data: np.ndarray, signed: bool) -> Optional[np.ndarray]:
+    """Let NumPy parse ``data`` if only numbers and whitespace are in it."""
+    if not signed and (data == MINUS).any():
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        try:
+            values = np.fromstring(data.tobytes(), np.int64, sep=' ')
+        except (ValueError, DeprecationWarning):
+            return None
+    # Blank inputs parse as a single 0, overflows saturate
+    if values.size == 1 and not (data - np.uint8(ZERO) < 10).any():
+        return values[:0]
+    if values.size and (values.max() == INT64.max
+                        or values.min() == INT64.min):
+        return None
+    return values
+
+
+def ints(data: np.ndarray,
+         signed: bool = True,
+         dtype: type = np.int64) -> np.ndarray:
+    """All the integers found in ``data``, whatever separates them.
+
+    With ``signed``, a minus sign right before a number negates it, which
+    is wrong for ranges like ``1-3``.
+    """
+    values = _parse_numeric(data, signed)
+    if values is None:
+        values = _values(data, *_tokens(data), signed)
+    return values.astype(dtype, copy=False)
+
+
+def record_breaks(data: np.ndarray) -> np.ndarray:
+    """Offsets of the blank lines separating records."""
+    data = rstrip(data)
+    return np.flatnonzero((data[:-1] == NEWLINE) & (data[1:] == NEWLINE))
+
+
+def records(data: np.ndarray) -> list[memoryview]:
+    """Blank-line separated records, as slices of ``data``."""
+    data = rstrip(data)
+    bounds = [0, *(record_breaks(data) + 2).tolist(), data.size + 2]
+    view = memoryview(data)
+    return [view[start:end - 2] for start, end in zip(bounds, bounds[1:])]
+
+
+def record_chunks(data: np.ndarray, size: int) -> Iterator[np.ndarray]:
+    """Slices of ``data`` of about ``size`` bytes holding whole records.
+
+    Each slice but the last ends on a blank line, so that records can be
+    processed a chunk at a time with bounded memory.
+    """
+    data = rstrip(data)
+    start = 0
+    while data.size - start > size:
+        end = start + size
+        window = size
+        while True:
+            # Look a bit further each time for the end of the last record
+            breaks = record_breaks(data[end - 1:end + window])
+            if breaks.size or end + window >= data.size:
+                break
+            window *= 2
+        if not breaks.size:
+            break
+        end += int(breaks[0]) + 1
+        yield data[start:end]
+        start = end
+    yield data[start:]
+
+
+def int_blocks(data: np.ndarray,
+               signed: bool = True,
+               dtype: type = np.int64) -> list[np.ndarray]:
+    """Integers of each blank-line separated record."""
+    starts, ends = _tokens(data)
+    values = _parse_numeric(data, signed)
+    if values is None or values.size != starts.size:
+        values = _values(data, starts, ends, signed)
+    values = values.astype(dtype, copy=False)
+    bounds = [0, *np.searchsorted(starts, record_breaks(data)).tolist(),
+              values.size]
+    return [values[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def char_matrix(data: np.ndarray) -> np.ndarray:
+    """Lines of equal length as a writable 2D array of their bytes."""
+    data = rstrip(data)
+    newlines = np.flatnonzero(data == NEWLINE)
+    width = newlines[0] if newlines.size else data.size
+    if not np.array_equal(newlines,
+                          np.arange(width, data.size, width + 1)) or (
+            data.size % (width + 1) != width):
+        raise ValueError('Lines differ in length')
+    lines = np.append(data, np.uint8(NEWLINE)).reshape(-1, width + 1)
+    return lines[:, :width].copy()
+
+
+def digit_matrix(data: np.ndarray, dtype: type = np.uint8) -> np.ndarray:
+    """Lines of digits of equal length as a 2D array of their values."""
+    matrix = char_matrix(data)
+    matrix -= ZERO
+    if matrix.size and matrix.max() > 9:
+        raise ValueError('Not a matrix of digits')
+    return matrix.astype(dtype, copy=False)
+
+
+def lines(filename: str) -> Iterator[str]:
+    """Lazily read the lines of a file, or of stdin for ``-``, stripped.
+
+    Unlike the functions above, nothing but the current line is kept in
+    memory, so that inputs of any size can be piped through a solver.
+    """
+    if filename == '-':
+        for line in sys.stdin:
+            yield line.strip()
+        return
+    with open(filename) as f:
+        for line in f:
+            yield line.strip()
@@ -0,0 +1,376 @@
+#!/usr/bin/env python
+"""Discover every YEAR/dayNN/solve.py and time its parse and parts.
+
+Each solver is expected to expose ``parse(filename)`` and optionally
+``part1(data)`` / ``part2(data)`` returning the puzzle answers.
+"""
+import json
+import os
+import re
+import signal
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from math import inf
+from importlib.util import module_from_spec, spec_from_file_location
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterable, Optional
+
+from aoc import ROOT
+from aoc.cache import Cache
+
+
+YEARS = (2020, 2021, 2022)
+PHASES = ('parse', 'part1', 'part2')
+
+
+class BudgetExceeded(BaseException):
+    """Raised inside a solver running past its wall-clock budget.
+
+    It derives from BaseException so that solvers catching broad exceptions
+    (e.g. the 2020 day08 interpreter loop) can't swallow it.
+    """
+
+
+@dataclass(frozen=True)
+class Day:
+    year: int
+    day: int
+    path: Path
+
+    @property
+    def name(self) -> str:
+        return f'{self.year}/day{self.day:02d}'
+
+    @property
+    def input(self) -> Path:
+        return self.path.parent / 'input.txt'
+
+    def load(self) -> ModuleType:
+        spec = spec_from_file_location(
+            f'aoc_{self.year}_day{self.day:02d}',
+            self.path,
+        )
+        module = module_from_spec(spec)
+        # Registered so that pickle can find the solver classes
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return module
+
+
+@dataclass
+class Measure:
+    phase: str
+    wall: float
+    cpu: float
+    peak: Optional[int]
+    answer: Any = None
+    cached: bool = False
+
+
+@dataclass
+class Result:
+    day: str
+    input: str
+    measures: list[Measure] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def discover(root: Path = ROOT,
+             years: Iterable[int] = YEARS) -> list[Day]:
+    days = []
+    for year in years:
+        for path in sorted((root / str(year)).glob('day*/solve.py')):
+            m = re.fullmatch(r'day(\d+)', path.parent.name)
+            if m:
+                days.append(Day(year, int(m[1]), path))
+    return days
+
+
+def select(days: list[Day], selectors: list[str]) -> list[Day]:
+    """Filter days on selectors such as ``2021`` or ``2021/day14``."""
+    if not selectors:
+        return days
+    return [
+        day for day in days
+        if any(day.name == s or str(day.year) == s for s in selectors)
+    ]
+
+
+def jsonable(answer: Any) -> Any:
+    if answer is None or isinstance(answer, (bool, str)):
+        return answer
+    try:
+        return int(answer) if int(answer) == answer else float(answer)
+    except (TypeError, ValueError, OverflowError):
+        return str(answer)
+
+
+def measure(phase: str,
+            func: Callable,
+            *args: Any,
+            memory: bool = True) -> tuple[Any, Measure]:
+    if memory:
+        tracemalloc.start()
+    try:
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        res = func(*args)
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        peak = tracemalloc.get_traced_memory()[1] if memory else None
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return res, Measure(phase, wall, cpu, peak)
+
+
+def _budget_exceeded(signum: int, frame: Any) -> None:
+    raise BudgetExceeded
+
+
+def run_day(day: Day,
+            filename: Optional[Path] = None,
+            memory: bool = True,
+            budget: Optional[float] = None,
+            module: Optional[ModuleType] = None,
+            cache: Optional[Cache] = None) -> Result:
+    """Time a day's phases, importing its solver unless ``module`` is given.
+
+    With a ``cache``, known answers are returned without solving anything
+    and parsed inputs are reloaded instead of parsed again.
+    """
+    filename = filename or day.input
+    result = Result(day.name, str(filename))
+    if budget:
+        previous = signal.signal(signal.SIGALRM, _budget_exceeded)
+        signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        module = module or day.load()
+        key = cache.key(day, filename) if cache else ''
+        answers = cache.get(key, 'answers') if cache else None
+        if answers is not None:
+            result.measures = [Measure(phase, 0.0, 0.0, None, answer, True)
+                               for phase, answer in answers.items()]
+            return result
+
+        data = None
+        if cache:
+            data, m = measure('parse', cache.get, key, 'parse', memory=memory)
+            m.cached = True
+        if data is None:
+            data, m = measure('parse', module.parse, str(filename),
+                              memory=memory)
+            if cache:
+                cache.put(key, 'parse', data)
+        result.measures.append(m)
+
+        answers = {}
+        for phase in PHASES[1:]:
+            if not hasattr(module, phase):
+                continue
+            answer, m = measure(phase, getattr(module, phase), data,
+                                memory=memory)
+            m.answer = answers[phase] = jsonable(answer)
+            result.measures.append(m)
+        if cache:
+            cache.put(key, 'answers', answers)
+    except BudgetExceeded:
+        result.error = f'killed after exceeding its {budget}s budget'
+    except Exception as e:
+        result.error = f'{type(e).__name__}: {e}'
+    finally:
+        if budget:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return result
+
+
+def load_timings(filename: str) -> dict[str, float]:
+    """Total wall time per day from a previous ``--json`` dump.
+
+    Days that failed or were killed count as infinitely long, like unknown
+    ones, since their measures stop short of their real time.
+    """
+    with open(filename) as f:
+        return {
+            r['day']: (inf if r.get('error')
+                       else sum(m['wall'] for m in r['measures']))
+            for r in json.load(f)
+        }
+
+
+def _run_worker(connection: Connection,
+                day: Day,
+                filename: Optional[Path],
+                memory: bool,
+                cache: Optional[Cache]) -> None:
+    with connection:
+        connection.send(run_day(day, filename, memory, cache=cache))
+
+
+def run_parallel(jobs: list[tuple[Day, Optional[Path]]],
+                 memory: bool = True,
+                 budget: Optional[float] = None,
+                 workers: Optional[int] = None,
+                 timings: Optional[dict[str, float]] = None,
+                 cache: Optional[Cache] = None) -> list[Result]:
+    """Run each day in its own worker process, longest known first.
+
+    Days without recorded timings are scheduled first since they may be the
+    slow ones. The budget is enforced from here: a worker still running
+    when its day runs out of time is killed, even in the middle of a long
+    C call, and a worker dying without an answer only fails its own day.
+    """
+    timings = timings or {}
+    pending = deque(sorted(jobs,
+                           key=lambda job: -timings.get(job[0].name, inf)))
+    workers = workers or os.cpu_count() or 1
+    running: dict[Connection, tuple[Day, Optional[Path], Process, float]] = {}
+    results = {}
+    while pending or running:
+        while pending and len(running) < workers:
+            day, filename = pending.popleft()
+            reader, writer = Pipe(duplex=False)
+            process = Process(target=_run_worker,
+                              args=(writer, day, filename, memory, cache),
+                              daemon=True)
+            process.start()
+            writer.close()
+            deadline = time.monotonic() + budget if budget else inf
+            running[reader] = (day, filename, process, deadline)
+
+        first_deadline = min(job[3] for job in running.values())
+        timeout = (None if first_deadline == inf
+                   else max(first_deadline - time.monotonic(), 0))
+        ready = wait(list(running), timeout)
+        now = time.monotonic()
+        for reader in list(running):
+            day, filename, process, deadline = running[reader]
+            if reader in ready:
+                try:
+                    result = reader.recv()
+                except EOFError:
+                    process.join()
+                    result = Result(day.name, str(filename or day.input),
+                                    error='worker died with exit code '
+                                          f'{process.exitcode}')
+            elif now >= deadline:
+                process.kill()
+                result = Result(day.name, str(filename or day.input),
+                                error=f'killed after exceeding its {budget}s '
+                                      'budget')
+            else:
+                continue
+            process.join()
+            reader.close()
+            del running[reader]
+            results[day] = result
+    return [results[day] for day, _ in sorted(jobs, key=lambda j: j[0].name)]
+
+
+def run_isolated(day: Day,
+                 filename: Optional[Path] = None,
+                 memory: bool = True,
+                 budget: Optional[float] = None,
+                 cache: Optional[Cache] = None) -> Result:
+    """Like run_day, in a worker process killed once over ``budget``."""
+    return run_parallel([(day, filename)], memory, budget, 1, cache=cache)[0]
+
+
+def format_size(size: Optional[int]) -> str:
+    if size is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f'{size:.0f}{unit}' if unit == 'B' else f'{size:.1f}{unit}'
+        size /= 1024
+    return f'{size:.1f}GiB'
+
+
+def format_table(results: list[Result]) -> str:
+    lines = [f'{"day":<10} {"phase":<6} {"wall (s)":>10} {"cpu (s)":>10} '
+             f'{"peak":>10}  answer']
+    for result in results:
+        for m in result.measures:
+            answer = '' if m.answer is None else str(m.answer)
+            if '\n' in answer:
+                answer = '<multiline>'
+            phase = f'{m.phase}*' if m.cached else m.phase
+            lines.append(f'{result.day:<10} {phase:<6} {m.wall:>10.4f} '
+                         f'{m.cpu:>10.4f} {format_size(m.peak):>10}  '
+                         f'{answer}')
+        if result.error:
+            lines.append(f'{result.day:<10} {"error":<6} {result.error}')
+    return '\n'.join(lines)
+
+
+def main(selectors: list[str],
+         input_name: Optional[str],
+         memory: bool,
+         json_output: Optional[str],
+         workers: int = 1,
+         budget: Optional[float] = None,
+         history: Optional[str] = None,
+         cache: Optional[Cache] = None) -> None:
+    jobs = []
+    for day in select(discover(), selectors):
+        filename = day.path.parent / input_name if input_name else None
+        if filename and not filename.exists():
+            continue
+        jobs.append((day, filename))
+
+    if workers == 1 and not budget:
+        results = [run_day(day, filename, memory, cache=cache)
+                   for day, filename in jobs]
+    else:
+        timings = load_timings(history) if history else None
+        results = run_parallel(jobs, memory, budget, workers or None, timings,
+                               cache)
+
+    if json_output == '-':
+        json.dump([asdict(r) for r in results], sys.stdout, indent=2)
+        print()
+        return
+
+    print(format_table(results))
+    if json_output:
+        with open(json_output, 'w') as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('days', nargs='*',
+                        help='years or days to run, e.g. 2021 or 2021/day14')
+    parser.add_argument('--input', '-i',
+                        help='input file name inside each day folder '
+                             '(default: input.txt)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip tracemalloc peak memory tracking')
+    parser.add_argument('--json', '-j', metavar='FILE',
+                        help='write results as JSON to FILE (- for stdout only)')
+    parser.add_argument('--parallel', '-p', type=int, default=1, metavar='N',
+                        help='run days on N worker processes (0: one per CPU)')
+    parser.add_argument('--budget', '-b', type=float, metavar='SECONDS',
+                        help='run each day in a worker process, killed and '
+                             'reported once running longer')
+    parser.add_argument('--history', metavar='FILE',
+                        help='previous --json dump used to schedule the '
+                             'longest days first')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='bypass the cache of parsed inputs and answers '
+                             '(cached phases are marked with *)')
+    args = parser.parse_args()
+    try:
+        main(args.days, args.input, not args.no_memory, args.json,
+             args.parallel, args.budget, args.history,
+             None if args.no_cache else Cache())
+    except KeyboardInterrupt:
+        pass
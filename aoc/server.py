@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""Long-lived solver daemon keeping every day module imported.
+
+Requests are JSON lines sent over a Unix domain socket, one per
+connection::
+
+    {"day": "2021/day14", "path": "/abs/path/input.txt"}
+    {"day": "2021/day14", "input": "NNCB\n\nCH -> B\n..."}
+    {"year": 2021, "day": 14}
+
+and get back the answers and timings of each phase. Each connection is
+handled by its own thread, while solving happens on a pool of worker
+processes which imported all the solvers once at startup. A worker which
+dies, or runs over the budget of a request and gets killed, is replaced
+by a fresh one.
+"""
+import json
+import os
+import socketserver
+import tempfile
+import threading
+from argparse import ArgumentParser
+from dataclasses import asdict
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from queue import SimpleQueue
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+from aoc.cache import Cache
+from aoc.client import send
+from aoc.runner import Day, discover, run_day
+
+
+DEFAULT_SOCKET = Path(tempfile.gettempdir()) / 'aoc-solver.sock'
+
+# Solver modules of a worker process, filled once it starts
+_modules: dict[str, tuple[Day, ModuleType]] = {}
+_cache: Optional[Cache] = None
+
+
+def _preload(cache: Optional[Cache] = None) -> None:
+    global _cache
+    _cache = cache
+    for day in discover():
+        try:
+            _modules[day.name] = (day, day.load())
+        except Exception:
+            # Broken solvers are reported when requested
+            pass
+
+
+def solve(name: str,
+          path: Optional[str] = None,
+          text: Optional[str] = None) -> dict[str, Any]:
+    try:
+        day, module = _modules[name]
+    except KeyError:
+        return {'day': name, 'error': f'Unknown or broken day {name}'}
+
+    if text is None:
+        result = run_day(day, Path(path) if path else None, False,
+                         module=module, cache=_cache)
+    else:
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as f:
+            f.write(text)
+            f.flush()
+            result = run_day(day, Path(f.name), False, module=module,
+                             cache=_cache)
+            result.input = '<stdin>'
+    return asdict(result)
+
+
+def _serve(connection: Connection, cache: Optional[Cache]) -> None:
+    _preload(cache)
+    with connection:
+        connection.send(None)
+        while True:
+            try:
+                request = connection.recv()
+            except EOFError:
+                return
+            connection.send(solve(*request))
+
+
+class Worker:
+    """Solver process serving one request at a time over a pipe."""
+
+    def __init__(self, cache: Optional[Cache]) -> None:
+        self.connection, child = Pipe()
+        self.process = Process(target=_serve, args=(child, cache),
+                               daemon=True)
+        self.process.start()
+        child.close()
+
+    def ready(self) -> None:
+        """Wait until all the solvers are imported."""
+        self.connection.recv()
+
+    def solve(self,
+              name: str,
+              path: Optional[str],
+              text: Optional[str],
+              budget: Optional[float]) -> dict[str, Any]:
+        """Answers of a day, killing the worker once over ``budget``."""
+        try:
+            self.connection.send((name, path, text))
+            if self.connection.poll(budget):
+                return self.connection.recv()
+        except (EOFError, OSError):
+            self.process.join()
+            return {'day': name, 'error': 'worker died with exit code '
+                                          f'{self.process.exitcode}'}
+        self.close()
+        return {'day': name,
+                'error': f'killed after exceeding its {budget}s budget'}
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def close(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class SolverHandler(socketserver.StreamRequestHandler):
+    server: 'SolverServer'
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            if 'year' in request:
+                name = f'{request["year"]}/day{int(request["day"]):02d}'
+            else:
+                name = request.get('day')
+            worker = self.server.checkout()
+            try:
+                response = worker.solve(
+                    name,
+                    request.get('path'),
+                    request.get('input'),
+                    request.get('budget', self.server.budget),
+                )
+            finally:
+                self.server.checkin(worker)
+        except Exception as e:
+            response = {'error': f'{type(e).__name__}: {e}'}
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+
+class SolverServer(socketserver.ThreadingMixIn,
+                   socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self,
+                 socket_path: Path,
+                 workers: Optional[int] = None,
+                 budget: Optional[float] = None,
+                 cache: Optional[Cache] = None) -> None:
+        self.budget = budget
+        self.cache = cache
+        # Idle workers, each taken by one request at a time
+        self.workers: SimpleQueue[Worker] = SimpleQueue()
+        # Spawn and warm the workers before accepting requests
+        workers = workers or os.cpu_count() or 1
+        started = [Worker(cache) for _ in range(workers)]
+        for worker in started:
+            worker.ready()
+            self.workers.put(worker)
+        if socket_path.exists():
+            socket_path.unlink()
+        super().__init__(str(socket_path), SolverHandler)
+
+    def replace(self, worker: Worker) -> Worker:
+        """Same worker if still alive, or a fresh one."""
+        if worker.alive:
+            return worker
+        worker.close()
+        worker = Worker(self.cache)
+        worker.ready()
+        return worker
+
+    def checkout(self) -> Worker:
+        # Workers may have been killed from outside while idle
+        return self.replace(self.workers.get())
+
+    def checkin(self, worker: Worker) -> None:
+        self.workers.put(self.replace(worker))
+
+    def server_close(self) -> None:
+        super().server_close()
+        while not self.workers.empty():
+            self.workers.get().close()
+        try:
+            os.unlink(self.server_address)
+        except FileNotFoundError:
+            pass
+
+
+def main(socket_path: Path,
+         workers: Optional[int],
+         budget: Optional[float],
+         cache: Optional[Cache]) -> None:
+    with SolverServer(socket_path, workers, budget, cache) as server:
+        print(f'Serving solvers on {socket_path}')
+        server.serve_forever()
+
+
+def check(name: str = '2021/day01') -> None:
+    """Serve on a temporary socket and solve a day asked for both ways."""
+    year, day = name.split('/day')
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = Path(tmp) / 'check.sock'
+        with SolverServer(socket_path, workers=1) as server:
+            thread = threading.Thread(target=server.serve_forever)
+            thread.start()
+            try:
+                by_name = send({'day': name}, socket_path)
+                by_number = send({'year': int(year), 'day': int(day)},
+                                 socket_path)
+            finally:
+                server.shutdown()
+                thread.join()
+    for response in by_name, by_number:
+        if response.get('error'):
+            raise RuntimeError(f'{name}: {response["error"]}')
+    answers = [[m['answer'] for m in response['measures']]
+               for response in (by_name, by_number)]
+    if answers[0] != answers[1]:
+        raise RuntimeError(f'{name}: {answers[0]} != {answers[1]}')
+    print(f'{name}: {answers[0]} both ways')
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('--socket', '-s', type=Path, default=DEFAULT_SOCKET,
+                        help=f'socket to listen on (default: {DEFAULT_SOCKET})')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='number of solver processes (default: one per CPU)')
+    parser.add_argument('--budget', '-b', type=float, metavar='SECONDS',
+                        help='kill and report any request running longer')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='bypass the cache of parsed inputs and answers')
+    parser.add_argument('--check', metavar='DAY', nargs='?',
+                        const='2021/day01',
+                        help='solve DAY by name and by year and number '
+                             'on a temporary socket, then exit')
+    args = parser.parse_args()
+    if args.check:
+        check(args.check)
+        raise SystemExit
+    try:
+        main(args.socket, args.workers, args.budget,
+             None if args.no_cache else Cache())
+    except KeyboardInterrupt:
+        pass